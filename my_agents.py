@@ -14,7 +14,7 @@ from tools.keyword_tool import DynamicKeywordExtractorTool
 from tools.serper_dev_tool import MySerperDevTool
 from tools.my_twitter_tool import TwitterFetchTool
 from tools.firecrawl_tool import FirecrawlTool
-from tools.my_serper_dev_tool import InternetSearchTool, InstagramSearchTool, OpenPageTool
+from tools.my_serper_dev_tool import InternetSearchTool, InstagramSearchTool, OpenPageTool, MultiSearchTool
 from crewai_tools import YoutubeVideoSearchTool
 from langgraph.store.memory import InMemoryStore
 from crewai.tools import BaseTool
@@ -83,8 +83,7 @@ base_memory_tools = [
 
 firecrawl_tool = FirecrawlTool()
 search_tool = MySerperDevTool()
-sentiment_tool = SentimentAnalysisTool()
-key_word_tool = DynamicKeywordExtractorTool()
+multi_search_tool = MultiSearchTool()
 exa_tool = EXAAnswerTool()
 twitter_fetch_tool = TwitterFetchTool()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -103,6 +102,11 @@ def create_llm():
     )
 
 def create_specialist_agents(brand_name, llm):
+    # Bound to this crew's brand, so its sentiment history, trending keywords and published results
+    # stay separate from other brands
+    sentiment_tool = SentimentAnalysisTool(default_brand=brand_name)
+    key_word_tool = DynamicKeywordExtractorTool(default_brand=brand_name)
+
     researcher = Agent(
         role="Social Media Researcher",
         goal=f"Gather comprehensive and accurate information about {brand_name} from diverse sources.",
@@ -114,7 +118,7 @@ def create_specialist_agents(brand_name, llm):
         ),
         verbose=True,
         allow_delegation=True,
-        tools=[search_tool, twitter_fetch_tool, exa_tool, firecrawl_tool] + base_memory_tools,
+        tools=[search_tool, multi_search_tool, twitter_fetch_tool, exa_tool, firecrawl_tool] + base_memory_tools,
         llm=llm,
         max_iter=2
     )
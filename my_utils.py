@@ -13,6 +13,8 @@ from crewai.memory.storage.rag_storage import RAGStorage
 from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
 from my_agents import create_llm, create_agents
 from tasks import create_tasks
+from tools.sentiment_result import latest_result
+from tools.mention_store import mention_store
 import agentops
 import os
 import logging
@@ -166,6 +168,7 @@ def run_social_media_monitoring(brand_name, max_retries=3):
     for attempt in range(max_retries):
         try:
             logger.info(f"Attempt {attempt + 1}: Starting crew kickoff for brand: {brand_name}")
+            kickoff_started = time.time()
             result = crew.kickoff()
             result_str = str(result)
 
@@ -179,8 +182,12 @@ def run_social_media_monitoring(brand_name, max_retries=3):
             else:
                 full_report = result_str
 
-            # Parse negative sentiment
-            negative_percentage = parse_negative_percentage(result_str)
+            # Prefer the exact numbers published by the sentiment tool; parse the transcript only as a fallback
+            sentiment_result = latest_result(brand_name, since=kickoff_started)
+            if sentiment_result is not None:
+                negative_percentage = round(sentiment_result.negative_percent, 2)
+            else:
+                negative_percentage = parse_negative_percentage(result_str)
             crisis_detected = negative_percentage > 50
 
             # Update time series data for trend plotting
@@ -190,11 +197,15 @@ def run_social_media_monitoring(brand_name, max_retries=3):
                 "Sentiment Score": 100 - negative_percentage
             })
 
-            # Extract tweets from the researcher's output
-            tweets = []
+            # Tweets fetched during this run come from the mention store; the transcript is the fallback
+            tweets = [
+                mention["payload"]
+                for batch in mention_store.scan(brand_name, source="twitter", fetched_since=kickoff_started)
+                for mention in batch
+            ]
             try:
                 tweets_start = result_str.find('{"data":')
-                if tweets_start != -1:
+                if not tweets and tweets_start != -1:
                     tweets_end = result_str.rfind('}')
                     tweets_data = json.loads(result_str[tweets_start:tweets_end + 1])
                     tweets = tweets_data.get("data", [])
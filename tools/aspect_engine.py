@@ -0,0 +1,191 @@
+import re
+import time
+import logging
+from typing import Dict, List, Optional, Any
+import numpy as np
+import torch
+from tools.length_batching import length_buckets
+
+logger = logging.getLogger(__name__)
+
+# Aspect categories and the terms probed for each of them
+ASPECT_TERMS = {
+    "product": ["quality", "features", "design", "performance"],
+    "service": ["support", "delivery", "response", "help"],
+    "brand": ["reputation", "image", "trust", "value"],
+    "price": ["cost", "value", "affordability", "pricing"]
+}
+
+# Word prefixes that make a category worth scoring for a text
+ASPECT_KEYWORDS = {
+    "product": ["quality", "feature", "design", "performance", "product", "build", "battery",
+                "screen", "camera", "device", "model", "broken", "defect", "work"],
+    "service": ["support", "deliver", "response", "respond", "help", "service", "customer",
+                "staff", "shipping", "refund", "wait", "order"],
+    "brand": ["reputation", "image", "trust", "value", "brand", "company", "scandal",
+              "ethic", "loyal", "boycott"],
+    "price": ["cost", "value", "afford", "pricing", "price", "expensive", "cheap", "money",
+              "worth", "discount", "deal", "overpriced"]
+}
+
+ASPECT_SENTIMENTS = ["positive", "negative", "neutral"]
+
+# Same template the transformers zero-shot pipeline uses by default
+HYPOTHESIS_TEMPLATE = "This example is {}."
+
+
+def zero_shot_aspects(nli_pipeline, text: str, threshold: float = 0.5) -> Dict[str, Dict]:
+    """Reference implementation: one zero-shot pipeline call per aspect term."""
+    results = {}
+    for category, terms in ASPECT_TERMS.items():
+        for term in terms:
+            result = nli_pipeline(
+                text,
+                candidate_labels=[f"{s} {term}" for s in ASPECT_SENTIMENTS],
+                multi_label=True
+            )
+            if result["scores"][0] > threshold:
+                results[f"{category}_{term}"] = {
+                    "sentiment": result["labels"][0].split()[0],
+                    "confidence": result["scores"][0]
+                }
+    return results
+
+
+class AspectEngine:
+    """
+    Scores every aspect hypothesis for a batch of texts in one batched NLI pass.
+
+    Each premise is tokenized once and paired with pre-tokenized hypotheses, and
+    categories with no matching keyword in the text are skipped entirely. Scores
+    follow the zero-shot pipeline's ``multi_label=True`` semantics (entailment vs.
+    contradiction softmax per hypothesis), so results have the same shape as
+    ``zero_shot_aspects``.
+    """
+
+    def __init__(self, nli_pipeline, batch_size: int = 64, threshold: float = 0.5,
+                 keyword_filter: bool = True):
+        self.model = nli_pipeline.model
+        self.tokenizer = nli_pipeline.tokenizer
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.keyword_filter = keyword_filter
+        self.forward_passes = 0
+
+        label2id = {label.lower(): idx for label, idx in self.model.config.label2id.items()}
+        self.entailment_id = next(idx for label, idx in label2id.items() if label.startswith("entail"))
+        self.contradiction_id = next(idx for label, idx in label2id.items() if label.startswith("contra"))
+
+        self._keyword_patterns = {
+            category: re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")", re.IGNORECASE)
+            for category, words in ASPECT_KEYWORDS.items()
+        }
+
+        # Hypotheses never change, so tokenize them once for the lifetime of the engine
+        self._hypothesis_ids = {
+            (term, sentiment): self.tokenizer.encode(
+                HYPOTHESIS_TEMPLATE.format(f"{sentiment} {term}"), add_special_tokens=False
+            )
+            for terms in ASPECT_TERMS.values() for term in terms for sentiment in ASPECT_SENTIMENTS
+        }
+        longest_hypothesis = max(len(ids) for ids in self._hypothesis_ids.values())
+        model_max = self.tokenizer.model_max_length
+        if not model_max or model_max > 4096:
+            model_max = 512
+        self.max_premise_length = model_max - longest_hypothesis - 4  # room for special tokens
+
+    def relevant_categories(self, text: str) -> List[str]:
+        """Aspect categories whose keywords appear in the text."""
+        if not self.keyword_filter:
+            return list(ASPECT_TERMS)
+        return [c for c, pattern in self._keyword_patterns.items() if pattern.search(text)]
+
+    def _entailment_scores(self, input_ids: List[List[int]]) -> np.ndarray:
+        """Entailment probability for each encoded premise/hypothesis pair."""
+        scores = np.empty(len(input_ids))
+        # Similar-length pairs share a batch so little compute goes to padding
+        for batch in length_buckets([len(ids) for ids in input_ids], self.batch_size):
+            encoded = self.tokenizer.pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt")
+            with torch.no_grad():
+                logits = self.model(**encoded).logits
+            self.forward_passes += 1
+            pair_logits = logits[:, [self.contradiction_id, self.entailment_id]]
+            scores[batch] = pair_logits.softmax(dim=-1)[:, 1].cpu().numpy()
+        return scores
+
+    def extract(self, texts: List[str]) -> List[Dict[str, Dict]]:
+        """Extract aspects and their sentiment for every text in one batched pass."""
+        slots = []  # (text index, category, term) per group of len(ASPECT_SENTIMENTS) pairs
+        input_ids = []
+        for i, text in enumerate(texts):
+            categories = self.relevant_categories(text)
+            if not categories:
+                continue
+            premise_ids = self.tokenizer.encode(
+                text, add_special_tokens=False, truncation=True, max_length=self.max_premise_length
+            )
+            for category in categories:
+                for term in ASPECT_TERMS[category]:
+                    for sentiment in ASPECT_SENTIMENTS:
+                        input_ids.append(self.tokenizer.build_inputs_with_special_tokens(
+                            premise_ids, self._hypothesis_ids[(term, sentiment)]
+                        ))
+                    slots.append((i, category, term))
+
+        results = [{} for _ in texts]
+        if not slots:
+            return results
+
+        scores = self._entailment_scores(input_ids).reshape(len(slots), len(ASPECT_SENTIMENTS))
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(slots)), best]
+        for (i, category, term), label_idx, score in zip(slots, best, best_scores):
+            if score > self.threshold:
+                results[i][f"{category}_{term}"] = {
+                    "sentiment": ASPECT_SENTIMENTS[label_idx],
+                    "confidence": float(score)
+                }
+        return results
+
+
+def benchmark(nli_pipeline, texts: List[str], batch_size: int = 64,
+              legacy_sample: Optional[int] = 20) -> Dict[str, Any]:
+    """
+    Compare per-term zero-shot calls with the batched engine.
+
+    The legacy path is timed on at most ``legacy_sample`` texts (it is slow) and
+    both timings are reported as seconds per 1k mentions.
+    """
+    legacy_texts = texts[:legacy_sample] if legacy_sample else texts
+    start = time.perf_counter()
+    for t in legacy_texts:
+        zero_shot_aspects(nli_pipeline, t)
+    legacy_per_1k = (time.perf_counter() - start) / len(legacy_texts) * 1000
+
+    engine = AspectEngine(nli_pipeline, batch_size=batch_size)
+    start = time.perf_counter()
+    engine.extract(texts)
+    engine_per_1k = (time.perf_counter() - start) / len(texts) * 1000
+
+    report = {
+        "texts": len(texts),
+        "legacy_seconds_per_1k": round(legacy_per_1k, 2),
+        "engine_seconds_per_1k": round(engine_per_1k, 2),
+        "engine_forward_passes": engine.forward_passes,
+        "speedup": round(legacy_per_1k / engine_per_1k, 2) if engine_per_1k else None
+    }
+    logger.info(f"Aspect engine benchmark: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    from transformers import pipeline
+
+    nli = pipeline("zero-shot-classification", model="facebook/bart-large-mnli", device=-1)
+    sample = [
+        "The battery life is terrible and support never answered my emails.",
+        "Great design, but way too expensive for what you get.",
+        "Delivery was fast and the price was fair.",
+        "Just saw their new ad on TV.",
+    ] * 250
+    print(benchmark(nli, sample))
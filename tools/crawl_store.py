@@ -0,0 +1,126 @@
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CRAWL_STATE_DB = os.getenv("CRAWL_STATE_DB", os.path.join("db", "crawl_state.db"))
+CRAWL_OUTPUT_DIR = os.getenv("CRAWL_OUTPUT_DIR", os.path.join("db", "crawls"))
+
+
+def content_hash(text: str) -> str:
+    """Hash of the page text with whitespace collapsed, so reflowed markup does not count as a change."""
+    return hashlib.sha256(" ".join((text or "").split()).encode("utf-8")).hexdigest()
+
+
+def _normalize_url(url: str) -> str:
+    return url.strip().rstrip("/")
+
+
+def site_key(url: str) -> str:
+    return urlparse(url if "://" in url else f"https://{url}").netloc.lower()
+
+
+class CrawlStore:
+    """
+    Per-URL content hashes of crawled pages, persisted to SQLite.
+
+    ``classify`` compares a batch of freshly crawled pages against the stored
+    hashes and marks each page new, changed or unchanged; ``record`` stores the
+    new hashes once a crawl has been fully written, so repeated crawls of a
+    site only re-process pages that changed, and a failed crawl loses nothing.
+    """
+
+    def __init__(self, db_path: Optional[str] = CRAWL_STATE_DB, output_dir: str = CRAWL_OUTPUT_DIR):
+        self.db_path = db_path or ":memory:"
+        self.output_dir = output_dir
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_pages ("
+                "url TEXT PRIMARY KEY, site TEXT NOT NULL, content_hash TEXT NOT NULL, "
+                "first_seen REAL NOT NULL, last_changed REAL NOT NULL, last_crawled REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_pages_site ON crawl_pages (site)")
+            self._conn.commit()
+        return self._conn
+
+    def classify(self, site: str, pages: List[Dict[str, str]], seen: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Status ("new", "changed" or "unchanged") of each ``{"url", "hash"}`` page,
+        in input order. Read-only: hashes are stored by ``record`` once the crawl
+        has been written out. ``seen`` collects the hashes of pages classified
+        earlier in the same crawl, so a URL that reappears is compared to its
+        first copy.
+        """
+        seen = {} if seen is None else seen
+        urls = [_normalize_url(p["url"]) for p in pages]
+        with self._lock:
+            conn = self._connection()
+            known = {}
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                known.update(conn.execute(
+                    f"SELECT url, content_hash FROM crawl_pages WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        statuses = []
+        for url, page in zip(urls, pages):
+            previous = seen[url] if url in seen else known.get(url)
+            statuses.append("new" if previous is None else "unchanged" if previous == page["hash"] else "changed")
+            seen.setdefault(url, page["hash"])
+        return statuses
+
+    def record(self, site: str, pages: List[Dict[str, str]]):
+        """Store the crawled hashes of ``{"url", "hash"}`` pages, so the next crawl is compared against them."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT INTO crawl_pages (url, site, content_hash, first_seen, last_changed, last_crawled) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET last_crawled = excluded.last_crawled, "
+                "last_changed = CASE WHEN content_hash = excluded.content_hash THEN last_changed ELSE excluded.last_changed END, "
+                "content_hash = excluded.content_hash",
+                [(_normalize_url(page["url"]), site, page["hash"], now, now, now) for page in pages]
+            )
+            conn.commit()
+
+    def known_pages(self, site: str) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM crawl_pages WHERE site = ?", (site,)
+            ).fetchone()[0]
+
+    def output_path(self, site: str) -> str:
+        """Fresh NDJSON file for one crawl run of ``site``."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return os.path.join(self.output_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', site)}-{stamp}.ndjson")
+
+
+def read_crawl(handle: str) -> Iterator[Dict[str, Any]]:
+    """Stream the pages of a crawl run back from its NDJSON handle, one dict per page."""
+    with open(handle, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# Shared by every FirecrawlTool in the process
+crawl_store = CrawlStore()
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+import numpy as np
+
+# Emotions of the j-hartmann model that count towards negative intensity
+NEGATIVE_EMOTIONS = ("anger", "disgust", "fear", "sadness")
+QUANTILES = (0.5, 0.9)
+# Per-text negative intensity above which a mention counts as strongly negative
+STRONG_INTENSITY = 0.8
+HISTOGRAM_BINS = 100
+
+
+@dataclass(slots=True)
+class EmotionProfile:
+    """
+    Array-backed summary of the full per-text emotion distributions of a snapshot.
+
+    ``mean`` and ``quantiles`` (rows follow ``QUANTILES``) are per label;
+    ``negative_intensity`` holds the mean and quantiles of each text's total
+    probability mass on ``NEGATIVE_EMOTIONS``.
+
+    ``texts`` is the number of texts with emotion scores and ``total_texts`` the
+    number analyzed; the cascade skips the emotion model for confidently positive
+    texts, in which case the profile is ``partial``. Means, dominant shares and
+    the strong-negative share are taken over all analyzed texts (skipped texts
+    count as carrying no emotion mass); quantiles only over scored ones.
+    """
+    labels: Tuple[str, ...]
+    texts: int
+    total_texts: int
+    mean: np.ndarray
+    quantiles: np.ndarray
+    dominant_share: np.ndarray
+    negative_intensity: np.ndarray
+    strong_negative_share: float
+
+    @property
+    def partial(self) -> bool:
+        return self.texts < self.total_texts
+
+    @classmethod
+    def from_matrix(cls, labels: Sequence[str], probs: np.ndarray,
+                    total_texts: Optional[int] = None) -> Optional["EmotionProfile"]:
+        """Exact profile from an ``(n_texts, n_labels)`` probability matrix out of ``total_texts`` analyzed."""
+        if probs.size == 0:
+            return None
+        labels = tuple(labels)
+        total = max(total_texts or 0, len(probs))
+        intensity = probs[:, _negative_columns(labels)].sum(axis=1)
+        return cls(
+            labels=labels,
+            texts=len(probs),
+            total_texts=total,
+            mean=probs.sum(axis=0) / total,
+            quantiles=np.quantile(probs, QUANTILES, axis=0),
+            dominant_share=np.bincount(probs.argmax(axis=1), minlength=len(labels)) / total,
+            negative_intensity=np.concatenate([[intensity.sum() / total], np.quantile(intensity, QUANTILES)]),
+            strong_negative_share=float(np.count_nonzero(intensity > STRONG_INTENSITY) / total)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "labels": list(self.labels),
+            "texts": self.texts,
+            "total_texts": self.total_texts,
+            "partial": self.partial,
+            "mean": dict(zip(self.labels, self.mean.round(4).tolist())),
+            "quantiles": {
+                f"p{int(q * 100)}": dict(zip(self.labels, row.round(4).tolist()))
+                for q, row in zip(QUANTILES, self.quantiles)
+            },
+            "dominant_share": dict(zip(self.labels, self.dominant_share.round(4).tolist())),
+            "negative_intensity": dict(
+                zip(["mean"] + [f"p{int(q * 100)}" for q in QUANTILES], self.negative_intensity.round(4).tolist())
+            ),
+            "strong_negative_share": round(self.strong_negative_share, 4),
+        }
+
+
+def _negative_columns(labels: Sequence[str]) -> List[int]:
+    return [i for i, label in enumerate(labels) if label in NEGATIVE_EMOTIONS]
+
+
+def emotion_matrix(emotion_dicts: List[Dict[str, float]]) -> Tuple[List[str], np.ndarray]:
+    """Stack per-text ``{label: prob}`` dicts (skipping empty ones) into a matrix."""
+    scored = [e for e in emotion_dicts if e]
+    labels = list(dict.fromkeys(label for e in scored for label in e))
+    matrix = np.array([[e.get(label, 0.0) for label in labels] for e in scored], dtype=np.float64)
+    return labels, matrix.reshape(len(scored), len(labels))
+
+
+def stack_matrices(parts: List[Tuple[List[str], np.ndarray]]) -> Tuple[List[str], np.ndarray]:
+    """Concatenate emotion matrices whose label orders may differ."""
+    labels = list(dict.fromkeys(label for part_labels, _ in parts for label in part_labels))
+    aligned = []
+    for part_labels, matrix in parts:
+        full = np.zeros((len(matrix), len(labels)))
+        for j, label in enumerate(part_labels):
+            full[:, labels.index(label)] = matrix[:, j]
+        aligned.append(full)
+    return labels, np.vstack(aligned) if aligned else np.zeros((0, len(labels)))
+
+
+class EmotionHistogram:
+    """
+    Fixed-memory streaming counterpart of ``EmotionProfile.from_matrix``.
+
+    Keeps per-label sums and probability histograms, so means are exact and
+    quantiles are accurate to one bin width (1 / ``HISTOGRAM_BINS``).
+    """
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.count = 0
+        self.sums = np.zeros(0)
+        self.hist = np.zeros((0, HISTOGRAM_BINS), dtype=np.int64)
+        self.dominant = np.zeros(0, dtype=np.int64)
+        self.intensity_sum = 0.0
+        self.intensity_hist = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        self.strong = 0
+
+    def _grow(self, labels):
+        new = [label for label in labels if label not in self.labels]
+        if new:
+            self.labels.extend(new)
+            self.sums = np.concatenate([self.sums, np.zeros(len(new))])
+            rows = np.zeros((len(new), HISTOGRAM_BINS), dtype=np.int64)
+            rows[:, 0] = self.count  # earlier texts had zero probability for unseen labels
+            self.hist = np.vstack([self.hist, rows])
+            self.dominant = np.concatenate([self.dominant, np.zeros(len(new), dtype=np.int64)])
+
+    def add(self, emotions: Dict[str, float]):
+        if not emotions:
+            return
+        self._grow(emotions)
+        vector = np.array([emotions.get(label, 0.0) for label in self.labels])
+        bins = np.minimum((vector * HISTOGRAM_BINS).astype(int), HISTOGRAM_BINS - 1)
+        self.count += 1
+        self.sums += vector
+        self.hist[np.arange(len(self.labels)), bins] += 1
+        self.dominant[vector.argmax()] += 1
+        intensity = float(vector[_negative_columns(self.labels)].sum())
+        self.intensity_sum += intensity
+        self.intensity_hist[min(int(intensity * HISTOGRAM_BINS), HISTOGRAM_BINS - 1)] += 1
+        self.strong += intensity > STRONG_INTENSITY
+
+    @staticmethod
+    def _hist_quantiles(hist: np.ndarray) -> np.ndarray:
+        cumulative = np.cumsum(hist, axis=-1) / hist.sum(axis=-1, keepdims=True)
+        centers = (np.arange(HISTOGRAM_BINS) + 0.5) / HISTOGRAM_BINS
+        return np.array([centers[np.argmax(cumulative >= q, axis=-1)] for q in QUANTILES])
+
+    def to_profile(self, total_texts: Optional[int] = None) -> Optional[EmotionProfile]:
+        """Profile of the scored texts out of ``total_texts`` analyzed (see ``EmotionProfile``)."""
+        if not self.count:
+            return None
+        total = max(total_texts or 0, self.count)
+        return EmotionProfile(
+            labels=tuple(self.labels),
+            texts=self.count,
+            total_texts=total,
+            mean=self.sums / total,
+            quantiles=self._hist_quantiles(self.hist),
+            dominant_share=self.dominant / total,
+            negative_intensity=np.concatenate(
+                [[self.intensity_sum / total], self._hist_quantiles(self.intensity_hist)]
+            ),
+            strong_negative_share=self.strong / total
+        )
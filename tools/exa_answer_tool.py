@@ -4,6 +4,9 @@ import requests
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type
+from tools.http_clients import http_clients
+from tools.response_cache import response_cache
+from tools.outbound_governor import outbound_governor, OutboundUnavailable
 
 class EXAAnswerToolSchema(BaseModel):
     query: str = Field(..., description="The question you want to ask Exa.")
@@ -25,26 +28,34 @@ class EXAAnswerTool(BaseTool):
             "x-api-key": api_key
         }
         
-        try:
-            response = requests.post(
-                self.answer_url,
-                json={"query": query, "text": True},
-                headers=headers,
-                timeout=10  
-            )
+        payload = {"query": query, "text": True}
+
+        def fetch():
+            response = http_clients.session("exa").post(self.answer_url, json=payload, headers=headers)
             response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            return f"Error: Failed to fetch answer from Exa - {str(e)}"
+            return response
 
         try:
-            response_data = response.json()
-            answer = response_data.get("answer", "No answer found.")
-            citations = response_data.get("citations", [])
-            output = f"Answer: {answer}\n\n"
-            if citations:
-                output += "Citations:\n"
-                for citation in citations:
-                    output += f"- {citation.get('title', 'No title')} ({citation.get('url', '')})\n"
-            return output
+            # Identical questions within the Exa TTL are answered from the shared response cache.
+            # The body is parsed outside the governed call, so a malformed answer is not retried
+            # or counted as a provider failure.
+            response_data = response_cache.get_or_fetch(
+                "exa", self.answer_url, payload,
+                lambda: outbound_governor.call("exa", fetch, retry_on=(requests.exceptions.RequestException,)).json(),
+                tool=self.name
+            )
         except ValueError:
-            return "Error: Invalid response format from Exa."
\ No newline at end of file
+            return "Error: Invalid response format from Exa."
+        except (requests.exceptions.RequestException, OutboundUnavailable) as e:
+            return f"Error: Failed to fetch answer from Exa - {str(e)}"
+
+        if not isinstance(response_data, dict):
+            return "Error: Invalid response format from Exa."
+        answer = response_data.get("answer", "No answer found.")
+        citations = response_data.get("citations", [])
+        output = f"Answer: {answer}\n\n"
+        if citations:
+            output += "Citations:\n"
+            for citation in citations:
+                output += f"- {citation.get('title', 'No title')} ({citation.get('url', '')})\n"
+        return output
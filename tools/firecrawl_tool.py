@@ -2,39 +2,199 @@
 import os
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import Type
-from crewai_tools import FirecrawlCrawlWebsiteTool, FirecrawlScrapeWebsiteTool, FirecrawlSearchTool
+from typing import Type, Optional, List, Dict, Any
+from crewai_tools import FirecrawlScrapeWebsiteTool, FirecrawlSearchTool
 import json
+import time
+import requests
+from tools.mention_store import mention_store, UNKNOWN_BRAND
+from tools.response_cache import response_cache
+from tools.outbound_governor import outbound_governor
+from tools.http_clients import http_clients
+from tools.crawl_store import crawl_store, content_hash, site_key
+
+FIRECRAWL_TOOLS = {
+    "search": FirecrawlSearchTool,
+    "scrape": FirecrawlScrapeWebsiteTool,
+}
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+# Firecrawl clients per mode, created once and shared across calls and tool instances
+_firecrawl_clients = {}
+
+
+def _firecrawl_client(mode: str):
+    if mode not in FIRECRAWL_TOOLS:
+        raise ValueError("Invalid mode. Use 'search', 'scrape', or 'crawl'.")
+    if mode not in _firecrawl_clients:
+        _firecrawl_clients[mode] = FIRECRAWL_TOOLS[mode]()
+    return _firecrawl_clients[mode]
 
 # Define the input schema for the tool
 class FirecrawlToolSchema(BaseModel):
     query: str = Field(..., description="The search query or URL to fetch data from the web (e.g., 'Tesla', 'https://example.com').")
     limit: int = Field(default=50, description="Number of results or pages to fetch (default: 50).")
     mode: str = Field(default="search", description="Mode of operation: 'search' (web search), 'scrape' (single page), or 'crawl' (entire site). Default: 'search'.")
+    brand: Optional[str] = Field(default=None, description="Brand the results are stored under (default: none).")
+    incremental: bool = Field(default=True, description="In 'crawl' mode, only return pages that changed since the last crawl of the site (default: True).")
 
 class FirecrawlTool(BaseTool):
     name: str = "Fetch Web Data with Firecrawl"
-    description: str = "A tool that fetches real web data using Firecrawl (search, scrape, or crawl) and returns it in JSON format."
+    description: str = (
+        "A tool that fetches real web data using Firecrawl (search, scrape, or crawl) and returns it in JSON format. "
+        "Crawl mode returns a summary of new and changed pages plus a handle to the stored pages."
+    )
     args_schema: Type[BaseModel] = FirecrawlToolSchema
 
-    def _run(self, query: str, limit: int = 50, mode: str = "search") -> str:
+    poll_interval: float = 2.0
+    crawl_timeout: float = 600.0
+    sample_size: int = 5
+
+    @staticmethod
+    def _to_mentions(items: List[Any], mode: str, brand: str) -> List[Dict[str, Any]]:
+        """Turn Firecrawl items (dicts with url/markdown/content fields) into mention-store rows."""
+        mentions = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            metadata = item.get("metadata") or {}
+            url = item.get("url") or metadata.get("sourceURL")
+            text = item.get("markdown") or item.get("content") or item.get("description") or ""
+            if not text.strip():
+                continue
+            mentions.append({
+                "source": f"firecrawl_{mode}",
+                "url": url,
+                "brand": brand,
+                "author": metadata.get("title") or item.get("title"),
+                "text": text,
+                "payload": {k: v for k, v in item.items() if k not in ("markdown", "content", "html")}
+            })
+        return mentions
+
+    def _crawl(self, url: str, limit: int, brand: str, incremental: bool, api_key: str) -> Dict[str, Any]:
+        """
+        Crawl a site through the Firecrawl crawl API, one result page at a time.
+
+        Each page's content hash is compared with the previous crawl; new and changed
+        pages (all pages when not ``incremental``) are appended to an NDJSON file and
+        the mention store, so only URLs and hashes are held in memory. The hashes are
+        recorded once the whole crawl is written; if it fails, the partial file is
+        deleted and the next crawl sees the same pages as new or changed again.
+        Returns a summary with the file's path as ``handle``.
+        """
+        site = site_key(url)
+        session = http_clients.session("firecrawl")
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+
+        def request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+            def send():
+                response = session.request(method, endpoint, headers=headers, **kwargs)
+                response.raise_for_status()
+                return response.json()
+            return outbound_governor.call("firecrawl", send, retry_on=(requests.exceptions.RequestException,))
+
+        job = request("POST", f"{FIRECRAWL_API_URL}/v1/crawl", json={
+            "url": url,
+            "limit": limit,
+            "scrapeOptions": {"formats": ["markdown"], "onlyMainContent": True}
+        })
+        status_url = job.get("url") or f"{FIRECRAWL_API_URL}/v1/crawl/{job['id']}"
+
+        # Poll until the job is done; results are then read from the start, following `next` links
+        deadline = time.time() + self.crawl_timeout
+        chunk = request("GET", status_url)
+        while chunk.get("status") == "scraping":
+            if time.time() > deadline:
+                raise TimeoutError(f"crawl of {url} did not finish within {self.crawl_timeout:.0f}s")
+            time.sleep(self.poll_interval)
+            chunk = request("GET", status_url)
+        if chunk.get("status") != "completed":
+            raise RuntimeError(f"crawl of {url} ended with status {chunk.get('status')!r}")
+
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        sample = []
+        seen: Dict[str, str] = {}
+        crawled = []
+        handle = crawl_store.output_path(site)
+        try:
+            with open(handle, "w", encoding="utf-8") as out:
+                while True:
+                    items = []
+                    for item in chunk.get("data") or []:
+                        if not isinstance(item, dict):
+                            continue
+                        text = item.get("markdown") or item.get("content") or ""
+                        page_url = item.get("url") or (item.get("metadata") or {}).get("sourceURL")
+                        if page_url and text.strip():
+                            items.append((page_url, text, item))
+                    pages = [{"url": u, "hash": content_hash(t)} for u, t, _ in items]
+                    statuses = crawl_store.classify(site, pages, seen)
+                    crawled.extend(pages)
+                    written = []
+                    for (page_url, text, item), page, status in zip(items, pages, statuses):
+                        counts[status] += 1
+                        if incremental and status == "unchanged":
+                            continue
+                        metadata = item.get("metadata") or {}
+                        out.write(json.dumps({
+                            "url": page_url,
+                            "title": metadata.get("title"),
+                            "status": status,
+                            "hash": page["hash"],
+                            "markdown": text,
+                            "metadata": metadata
+                        }, ensure_ascii=False) + "\n")
+                        written.append({**item, "url": page_url})
+                        if len(sample) < self.sample_size:
+                            sample.append({"url": page_url, "title": metadata.get("title"), "status": status})
+                    mention_store.upsert_many(self._to_mentions(written, "crawl", brand))
+                    if not chunk.get("next"):
+                        break
+                    chunk = request("GET", chunk["next"])
+        except BaseException:
+            # Nothing was recorded, so the next crawl reports these pages again
+            os.remove(handle)
+            raise
+        crawl_store.record(site, crawled)
+
+        return {
+            "mode": "crawl",
+            "query": url,
+            "incremental": incremental,
+            "handle": handle,
+            "pages": sum(counts.values()),
+            **counts,
+            "written": counts["new"] + counts["changed"] + (0 if incremental else counts["unchanged"]),
+            "known_pages": crawl_store.known_pages(site),
+            "sample": sample
+        }
+
+    def _run(self, query: str, limit: int = 50, mode: str = "search", brand: Optional[str] = None,
+             incremental: bool = True) -> str:
         # Load Firecrawl API key from environment variables
         api_key = os.getenv("FIRECRAWL_API_KEY")
         if not api_key:
             raise ValueError("Firecrawl API key is missing. Set FIRECRAWL_API_KEY in environment variables.")
 
         try:
+            if mode == "crawl":
+                # Streamed to disk instead of cached: only a compact summary and a handle are returned
+                summary = self._crawl(query, limit, brand or UNKNOWN_BRAND, incremental, api_key)
+                print(f"✅ Crawled {summary['pages']} pages for '{query}': {summary['new']} new, "
+                      f"{summary['changed']} changed, {summary['unchanged']} unchanged.")
+                return json.dumps(summary)
+
+            tool = _firecrawl_client(mode)
             if mode == "search":
-                tool = FirecrawlSearchTool()
-                results = tool.run(query=query, search_options={"limit": limit}, fetchPageContent=True)
-            elif mode == "scrape":
-                tool = FirecrawlScrapeWebsiteTool()
-                results = tool.run(url=query, onlyMainContent=True)
-            elif mode == "crawl":
-                tool = FirecrawlCrawlWebsiteTool()
-                results = tool.run(url=query, crawler_options={"limit": limit, "onlyMainContent": True})
+                fetch = lambda: tool.run(query=query, search_options={"limit": limit}, fetchPageContent=True)
             else:
-                raise ValueError("Invalid mode. Use 'search', 'scrape', or 'crawl'.")
+                fetch = lambda: tool.run(url=query, onlyMainContent=True)
+            # Repeated searches, scrapes and crawls within the Firecrawl TTL are served from the response cache
+            results = response_cache.get_or_fetch(
+                "firecrawl", mode, {"query": query, "limit": limit},
+                lambda: outbound_governor.call("firecrawl", fetch, retry_on=(requests.exceptions.RequestException,)),
+                tool=self.name
+            )
 
             # Format results into JSON
             formatted_data = {
@@ -43,6 +203,8 @@ class FirecrawlTool(BaseTool):
                 "data": results if isinstance(results, list) else [{"content": results}]
             }
 
+            mention_store.upsert_many(self._to_mentions(formatted_data["data"], mode, brand or UNKNOWN_BRAND))
+
             print(f"✅ Fetched {len(formatted_data['data'])} items for '{query}' in {mode} mode.")
             return json.dumps(formatted_data)
 
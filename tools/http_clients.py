@@ -0,0 +1,149 @@
+import threading
+import logging
+from typing import Dict, Optional, Tuple, Union, Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Per-provider connection pool size and (connect, read) timeouts in seconds
+PROVIDER_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "serper": {"pool_size": 10, "timeout": (3.05, 10)},
+    "exa": {"pool_size": 4, "timeout": (3.05, 30)},
+    "twitter": {"pool_size": 4, "timeout": (3.05, 30)},
+    "firecrawl": {"pool_size": 4, "timeout": (3.05, 60)},
+    "web": {"pool_size": 10, "timeout": (3.05, 20)},
+}
+DEFAULT_SETTINGS = {"pool_size": 4, "timeout": (3.05, 30)}
+
+
+def _counting_pool(pool_cls, stats: Dict[str, int]):
+    """Connection pool class that counts newly opened connections into ``stats``."""
+    class CountingPool(pool_cls):
+        def _new_conn(self):
+            stats["connections"] += 1
+            return super()._new_conn()
+    return CountingPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose urllib3 pools report every new connection."""
+
+    def __init__(self, stats: Dict[str, int], **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+
+class ProviderSession(requests.Session):
+    """Keep-alive session that applies the provider's default timeout."""
+
+    def __init__(self, timeout: Timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+class BorrowedSession:
+    """
+    Proxy to a shared provider session for client libraries that close their
+    session after every call (tweepy's ``API.request`` does): ``close`` is a
+    no-op, so the pooled connections survive. The session is looked up on each
+    use, so ``configure`` still takes effect.
+    """
+
+    def __init__(self, clients: "HttpClients", provider: str):
+        self._clients = clients
+        self._provider = provider
+
+    def __getattr__(self, name):
+        return getattr(self._clients.session(self._provider), name)
+
+    def close(self):
+        pass
+
+
+class HttpClients:
+    """
+    One pooled, keep-alive HTTP session per provider, shared across tool instances.
+
+    Sessions are created on first use with the provider's pool size and default
+    timeout from ``PROVIDER_SETTINGS`` (``configure`` overrides them and rebuilds
+    the session). ``stats`` reports requests sent and connections opened, so
+    connection reuse can be checked.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.settings = {k: dict(v) for k, v in (settings or PROVIDER_SETTINGS).items()}
+        self._sessions: Dict[str, ProviderSession] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, pool_size: Optional[int] = None, timeout: Optional[Timeout] = None):
+        with self._lock:
+            settings = self.settings.setdefault(provider, dict(DEFAULT_SETTINGS))
+            if pool_size is not None:
+                settings["pool_size"] = pool_size
+            if timeout is not None:
+                settings["timeout"] = timeout
+            session = self._sessions.pop(provider, None)
+        if session is not None:
+            session.close()
+
+    def session(self, provider: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(provider)
+            if session is None:
+                settings = self.settings.setdefault(provider, dict(DEFAULT_SETTINGS))
+                stats = self._stats.setdefault(provider, {"requests": 0, "connections": 0})
+                session = ProviderSession(settings["timeout"])
+                adapter = PooledAdapter(
+                    stats, pool_connections=settings["pool_size"], pool_maxsize=settings["pool_size"]
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+
+                def count_request(response, *args, **kwargs):
+                    stats["requests"] += 1
+                session.hooks["response"].append(count_request)
+                self._sessions[provider] = session
+                logger.info(f"Created HTTP session for {provider} (pool size {settings['pool_size']})")
+            return session
+
+    def borrowed_session(self, provider: str) -> BorrowedSession:
+        """The provider's shared session, wrapped so the borrower cannot close it."""
+        return BorrowedSession(self, provider)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, connections opened and the share of requests that reused a connection, per provider."""
+        report = {}
+        for provider, stats in self._stats.items():
+            requests_sent, connections = stats["requests"], stats["connections"]
+            report[provider] = {
+                **stats,
+                "reused": max(requests_sent - connections, 0),
+                "reuse_ratio": max(requests_sent - connections, 0) / requests_sent if requests_sent else 0.0,
+            }
+        return report
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Shared by every tool in the process
+http_clients = HttpClients()
@@ -0,0 +1,121 @@
+import asyncio
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Any
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Micro-batching request coalescer in front of a batched inference function.
+
+    Callers ``await submit(texts)`` from any event loop (or thread); requests that
+    arrive within ``max_wait_ms`` of the first queued one are merged into a single
+    ``infer`` call of at most ``max_batch_size`` texts (a single larger request is
+    never split and runs as its own batch). Batches are collected and inferred on
+    one dedicated background thread, and each caller gets back exactly its own
+    records. At most ``max_queue`` requests wait at a time; further submits wait
+    (without blocking their event loop) until there is room.
+    """
+
+    def __init__(self, infer: Callable[[List[str]], List[Dict[str, Any]]], max_batch_size: int = 64,
+                 max_wait_ms: float = 10.0, max_queue: int = 1024, latency_window: int = 2048):
+        self.infer = infer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._carry: Optional[tuple] = None  # request held back because it would overflow the last batch
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=latency_window)
+        self._stats = {"requests": 0, "texts": 0, "batches": 0, "max_depth": 0, "inference_seconds": 0.0}
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._drain, name="sentiment-inference", daemon=True)
+                self._thread.start()
+
+    async def submit(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Queue ``texts`` for the next coalesced batch and wait for their records."""
+        self._ensure_worker()
+        future: Future = Future()
+        item = (texts, future, time.perf_counter())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, item)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+        return await asyncio.wrap_future(future)
+
+    def _collect(self) -> List[tuple]:
+        """First queued request plus whatever else fits and arrives within the wait window."""
+        first, self._carry = self._carry or self._queue.get(), None
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                self._carry = item  # starts the next batch
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _drain(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            self._waits.extend(started - enqueued for _, _, enqueued in batch)
+            texts = [text for request, _, _ in batch for text in request]
+            try:
+                records = self.infer(texts)
+            except Exception as e:
+                logger.error(f"Coalesced inference of {len(texts)} texts failed: {str(e)}")
+                for _, future, _ in batch:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+                continue
+            finally:
+                with self._lock:
+                    self._stats["batches"] += 1
+                    self._stats["texts"] += len(texts)
+                    self._stats["inference_seconds"] += time.perf_counter() - started
+
+            offset = 0
+            for request, future, _ in batch:
+                # Callers that were cancelled meanwhile are skipped
+                if future.set_running_or_notify_cancel():
+                    future.set_result(records[offset:offset + len(request)])
+                offset += len(request)
+            logger.debug(f"Coalesced {len(batch)} requests into one batch of {len(texts)} texts")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, batch sizes and queue-wait latency percentiles (milliseconds)."""
+        waits = np.array(self._waits) * 1000
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize() + (self._carry is not None),
+            "mean_batch_texts": self._stats["texts"] / batches if batches else 0.0,
+            "requests_per_batch": self._stats["requests"] / batches if batches else 0.0,
+            "queue_wait_ms": {
+                "p50": float(np.percentile(waits, 50)) if waits.size else 0.0,
+                "p95": float(np.percentile(waits, 95)) if waits.size else 0.0,
+                "max": float(waits.max()) if waits.size else 0.0,
+            },
+        }
@@ -1,30 +1,72 @@
 import spacy
+import logging
+import threading
 from collections import Counter
 from crewai.tools import BaseTool
-from typing import Union, List
+from typing import Union, List, Iterable, Optional
+from tools.trending_keywords import trending_keywords
+
+logger = logging.getLogger(__name__)
+
+ENTITY_LABELS = {"PERSON", "ORG", "PRODUCT", "GPE", "EVENT"}
+
+_nlp_cache = {}
+_nlp_lock = threading.Lock()
+
+
+def load_ner(model_name: str = "en_core_web_sm"):
+    """
+    Load a spaCy pipeline once per process, keeping only NER and the components
+    it listens to (a shared tok2vec in some pipelines). The other components are
+    removed so they never run and their weights are freed.
+    """
+    with _nlp_lock:
+        if model_name not in _nlp_cache:
+            nlp = spacy.load(model_name)
+            keep = {"ner"}
+            for name, pipe in nlp.pipeline:
+                if "ner" in getattr(pipe, "listening_components", []):
+                    keep.add(name)
+            for name in [n for n in nlp.pipe_names if n not in keep]:
+                nlp.remove_pipe(name)
+            logger.info(f"Loaded spaCy model {model_name} with components {nlp.pipe_names}")
+            _nlp_cache[model_name] = nlp
+        return _nlp_cache[model_name]
 
-# Load spaCy’s English model
-nlp = spacy.load("en_core_web_sm")
 
 class DynamicKeywordExtractorTool(BaseTool):
     name: str = "Dynamic Keyword Extractor Tool"
     description: str = "Extracts dynamic keywords from text using entity recognition and frequency analysis."
+    model_name: str = "en_core_web_sm"
+    batch_size: int = 256  # texts per nlp.pipe batch
+    n_process: int = 1  # worker processes for nlp.pipe
+    track_trends: bool = True  # feed entity counts to the shared trending-keyword detector
+    default_brand: str = "default"  # brand the counts are filed under when a call names none
+
+    def count_entities(self, texts: Iterable[str]) -> Counter:
+        """Stream texts through ``nlp.pipe`` and count keyword entities as documents come out."""
+        nlp = load_ner(self.model_name)
+        entity_freq = Counter()
+        for doc in nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process):
+            entity_freq.update(ent.text for ent in doc.ents if ent.label_ in ENTITY_LABELS)
+        return entity_freq
 
-    def _run(self, texts: Union[str, List[str]], top_n: int = 5) -> list:
+    def _run(self, texts: Union[str, List[str]], top_n: int = 5, brand: Optional[str] = None) -> list:
         """
         Extract dynamic keywords from texts using entity recognition and frequency.
 
         Args:
             texts (Union[str, List[str]]): Text or list of texts to process.
             top_n (int): Number of keywords to return (default: 5).
+            brand (str): Brand whose trending-keyword history the counts are added to
+                (default: the tool's ``default_brand``).
 
         Returns:
             list: Top N keywords extracted.
         """
         if isinstance(texts, str):
             texts = [texts]
-        all_text = " ".join(texts)
-        doc = nlp(all_text)
-        entities = [ent.text for ent in doc.ents if ent.label_ in ["PERSON", "ORG", "PRODUCT", "GPE", "EVENT"]]
-        entity_freq = Counter(entities)
-        return [keyword for keyword, freq in entity_freq.most_common(top_n)]
\ No newline at end of file
+        entity_freq = self.count_entities(texts)
+        if self.track_trends:
+            trending_keywords.add_counts(brand or self.default_brand, entity_freq.items())
+        return [keyword for keyword, freq in entity_freq.most_common(top_n)]
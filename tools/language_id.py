@@ -0,0 +1,52 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List
+
+# Characters that only occur in Vietnamese among Latin-script languages
+VIETNAMESE_CHARS = set("ăâđêôơưĂÂĐÊÔƠƯ") | {chr(c) for c in range(0x1EA0, 0x1EFA)}
+
+# Short, high-frequency function words per language
+STOPWORDS = {
+    "en": {"the", "and", "is", "are", "to", "of", "it", "this", "that", "was", "for", "with", "my", "not", "you", "i"},
+    "fr": {"le", "la", "les", "et", "est", "une", "des", "pas", "je", "que", "pour", "avec", "ce", "du"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "ich", "ein", "eine", "mit", "zu", "auf", "für"},
+    "es": {"el", "los", "las", "y", "es", "que", "una", "por", "para", "con", "muy", "pero", "del"},
+    "it": {"il", "gli", "e", "è", "che", "una", "per", "con", "non", "sono", "della", "molto"},
+    "nl": {"de", "het", "een", "en", "is", "niet", "ik", "dat", "van", "met", "voor", "zijn"},
+}
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def detect_language(text: str) -> str:
+    """
+    Cheap language guess for routing between sentiment models.
+
+    Returns "vi" for Vietnamese diacritics, "other" for mostly non-Latin scripts,
+    otherwise the stopword-richest of the languages in ``STOPWORDS`` ("en" when
+    there is no evidence either way, e.g. hashtags or product names only).
+    """
+    letters = [ch for ch in text if ch.isalpha()]
+    if not letters:
+        return "en"
+    if any(ch in VIETNAMESE_CHARS for ch in letters):
+        return "vi"
+    non_latin = sum(1 for ch in letters if not unicodedata.name(ch, "").startswith("LATIN"))
+    if non_latin / len(letters) > 0.3:
+        return "other"
+
+    words = [w.lower() for w in _WORD.findall(text)]
+    hits = Counter({lang: sum(1 for w in words if w in vocab) for lang, vocab in STOPWORDS.items()})
+    lang, count = hits.most_common(1)[0]
+    if count == 0 or hits[lang] == hits["en"]:
+        return "en"
+    return lang
+
+
+def group_by_language(texts: List[str]) -> Dict[str, List[int]]:
+    """Indices of ``texts`` grouped by detected language, preserving input order."""
+    groups: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        groups.setdefault(detect_language(text), []).append(i)
+    return groups
@@ -0,0 +1,131 @@
+import logging
+from typing import Callable, Dict, List, Optional, Tuple, Union, Any
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Upper token-length bounds of the buckets; each bucket is padded only to its own longest member
+BUCKET_BOUNDARIES = (16, 32, 64, 128, 256, 512)
+
+
+def length_buckets(lengths: List[int], batch_size: int,
+                   boundaries: Tuple[int, ...] = BUCKET_BOUNDARIES) -> List[List[int]]:
+    """Group indices by length bucket (shortest first) and split each bucket into batches."""
+    if not lengths:
+        return []
+    lengths = np.asarray(lengths)
+    order = np.argsort(lengths, kind="stable")
+    bucket_ids = np.searchsorted(np.asarray(boundaries), lengths[order], side="left")
+    batches = []
+    for bucket in np.unique(bucket_ids):
+        members = order[bucket_ids == bucket].tolist()
+        batches.extend(members[i:i + batch_size] for i in range(0, len(members), batch_size))
+    return batches
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class ChunkedClassifier:
+    """
+    Length-aware text classifier over a tokenizer and a logits function.
+
+    Texts are tokenized once. Documents longer than the model's window are split
+    into consecutive chunks, every chunk is sorted into a length bucket, and each
+    bucket runs as its own padded batch. Chunk probabilities are averaged back to
+    their document, weighted by chunk length. Calling the object returns the same
+    structure as a transformers text-classification pipeline.
+    """
+
+    def __init__(self, tokenizer, forward: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                 id2label: Dict[int, str], max_length: int = 512, batch_size: int = 32,
+                 source: Any = None):
+        self.tokenizer = tokenizer
+        self.forward = forward
+        self.id2label = {int(k): v for k, v in id2label.items()}
+        model_max = tokenizer.model_max_length or max_length
+        self.max_length = min(max_length, model_max)
+        self.window = self.max_length - tokenizer.num_special_tokens_to_add(pair=False)
+        self.batch_size = batch_size
+        self.source = source  # the pipeline or backend this classifier wraps
+        self.pad_token_id = tokenizer.pad_token_id or 0
+        self.stats = {"documents": 0, "chunks": 0, "real_tokens": 0, "padded_tokens": 0}
+
+    @classmethod
+    def from_model(cls, model, batch_size: int = 32, max_length: int = 512) -> "ChunkedClassifier":
+        """Wrap a transformers pipeline or any backend exposing ``tokenizer``, ``forward`` and ``id2label``."""
+        if hasattr(model, "forward") and hasattr(model, "id2label"):
+            return cls(model.tokenizer, model.forward, model.id2label, max_length, batch_size, source=model)
+
+        import torch
+
+        torch_model = model.model
+
+        def forward(input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+            with torch.no_grad():
+                logits = torch_model(
+                    input_ids=torch.from_numpy(input_ids), attention_mask=torch.from_numpy(attention_mask)
+                ).logits
+            return logits.float().cpu().numpy()
+
+        return cls(model.tokenizer, forward, torch_model.config.id2label, max_length, batch_size, source=model)
+
+    def _chunk(self, texts: List[str]):
+        """Tokenize once and cut each document into windows that fit the model."""
+        token_ids = self.tokenizer(texts, add_special_tokens=False, truncation=False, verbose=False)["input_ids"]
+        chunks, owners, weights = [], [], []
+        for doc, ids in enumerate(token_ids):
+            starts = range(0, len(ids), self.window) if ids else [0]
+            for start in starts:
+                piece = ids[start:start + self.window]
+                chunks.append(self.tokenizer.build_inputs_with_special_tokens(piece))
+                owners.append(doc)
+                weights.append(max(len(piece), 1))
+        return chunks, np.asarray(owners), np.asarray(weights, dtype=float)
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Class probabilities per document, shape ``(len(texts), num_labels)``."""
+        num_labels = len(self.id2label)
+        if not texts:
+            return np.empty((0, num_labels))
+        chunks, owners, weights = self._chunk(texts)
+        chunk_probs = np.zeros((len(chunks), num_labels))
+
+        for batch in length_buckets([len(c) for c in chunks], self.batch_size):
+            longest = max(len(chunks[i]) for i in batch)
+            input_ids = np.full((len(batch), longest), self.pad_token_id, dtype=np.int64)
+            attention_mask = np.zeros((len(batch), longest), dtype=np.int64)
+            for row, i in enumerate(batch):
+                input_ids[row, :len(chunks[i])] = chunks[i]
+                attention_mask[row, :len(chunks[i])] = 1
+            chunk_probs[batch] = softmax(self.forward(input_ids, attention_mask))
+            self.stats["real_tokens"] += int(attention_mask.sum())
+            self.stats["padded_tokens"] += attention_mask.size
+
+        doc_probs = np.zeros((len(texts), num_labels))
+        np.add.at(doc_probs, owners, chunk_probs * weights[:, None])
+        doc_probs /= np.bincount(owners, weights=weights, minlength=len(texts))[:, None]
+
+        self.stats["documents"] += len(texts)
+        self.stats["chunks"] += len(chunks)
+        return doc_probs
+
+    def __call__(self, inputs: Union[str, List[str]], top_k: Optional[int] = 1,
+                 **kwargs) -> List[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        probs = self.predict_proba(texts)
+        if top_k == 1:
+            best = probs.argmax(axis=1)
+            return [{"label": self.id2label[int(i)], "score": float(p[i])} for i, p in zip(best, probs)]
+        ranked = np.argsort(-probs, axis=1)[:, :top_k]
+        return [
+            [{"label": self.id2label[int(i)], "score": float(p[i])} for i in order]
+            for order, p in zip(ranked, probs)
+        ]
+
+    def padding_efficiency(self) -> float:
+        """Share of processed positions that were real tokens rather than padding."""
+        padded = self.stats["padded_tokens"]
+        return self.stats["real_tokens"] / padded if padded else 1.0
@@ -0,0 +1,73 @@
+import re
+from typing import Dict, Iterable, Optional, Any
+
+# Polarity words with weights: 2 for strong, unambiguous terms, 1 otherwise
+POSITIVE_WORDS = {
+    "good": 1, "great": 1, "nice": 1, "happy": 1, "like": 1, "love": 2, "loved": 2, "loving": 2,
+    "excellent": 2, "amazing": 2, "awesome": 2, "fantastic": 2, "perfect": 2, "best": 2,
+    "wonderful": 2, "positive": 1, "recommend": 1, "impressed": 2, "thanks": 1, "thank": 1,
+    "fast": 1, "reliable": 1, "beautiful": 1, "enjoy": 1, "enjoyed": 1, "superb": 2, "brilliant": 2,
+}
+NEGATIVE_WORDS = {
+    "bad": 1, "poor": 1, "slow": 1, "broken": 2, "terrible": 2, "awful": 2, "horrible": 2,
+    "worst": 2, "hate": 2, "hated": 2, "disappointed": 2, "disappointing": 2, "useless": 2,
+    "scam": 2, "fraud": 2, "refund": 1, "problem": 1, "issue": 1, "complaint": 1, "negative": 1,
+    "crisis": 2, "urgent": 1, "emergency": 2, "boycott": 2, "angry": 2, "fail": 1, "failed": 1,
+    "failure": 1, "unacceptable": 2, "dangerous": 2, "defective": 2, "lawsuit": 2,
+}
+NEGATIONS = {"not", "no", "never", "dont", "don't", "doesnt", "doesn't", "isnt", "isn't", "wasnt",
+             "wasn't", "cant", "can't", "won't", "hardly", "without", "nothing"}
+# Words that signal mixed or hedged statements, which the lexicon should not decide
+CONTRASTS = {"but", "however", "though", "although", "yet", "except"}
+
+_TOKEN = re.compile(r"[a-z']+|[.,;:!]")
+
+
+class LexiconScorer:
+    """
+    Cheap weighted-lexicon sentiment scorer for the first tier of the cascade.
+
+    Only clear-cut texts get a confident answer: polarity words must agree, the
+    text must not contain contrast words or questions, and confidence grows with
+    the total weight of the matched words. Negations flip up to the next three
+    tokens, stopping at punctuation.
+    """
+
+    def __init__(self, custom_keywords: Optional[Iterable[str]] = None):
+        self.positive = dict(POSITIVE_WORDS)
+        self.negative = dict(NEGATIVE_WORDS)
+        # Custom keywords not already in the lexicon are treated as crisis (negative) terms
+        for keyword in custom_keywords or []:
+            word = keyword.lower()
+            if word not in self.positive and word not in self.negative:
+                self.negative[word] = 1
+
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """``{"label", "score"}`` like the transformer pipelines, or None without evidence."""
+        if "?" in text:
+            return None
+        tokens = _TOKEN.findall(text.lower())
+        positive = negative = 0
+        negate_until = -1
+        for i, token in enumerate(tokens):
+            if token in CONTRASTS:
+                return None
+            if token in NEGATIONS:
+                negate_until = i + 3
+                continue
+            if token in ".,;:!":
+                negate_until = -1  # punctuation ends the negation scope
+                continue
+            weight_pos = self.positive.get(token, 0)
+            weight_neg = self.negative.get(token, 0)
+            if i <= negate_until:
+                weight_pos, weight_neg = weight_neg, weight_pos
+            positive += weight_pos
+            negative += weight_neg
+
+        total = positive + negative
+        if total == 0:
+            return None
+        agreement = abs(positive - negative) / total
+        confidence = agreement * (1 - 0.5 ** total)
+        return {"label": "POSITIVE" if positive > negative else "NEGATIVE", "score": confidence}
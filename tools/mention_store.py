@@ -0,0 +1,162 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+import logging
+from typing import Dict, Iterator, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+MENTION_STORE_DB = os.getenv("MENTION_STORE_DB", os.path.join("db", "mentions.db"))
+# Brand of mentions fetched without one (e.g. a search the agent ran without naming the brand)
+UNKNOWN_BRAND = ""
+
+
+def mention_id(source: str, native_id: Optional[str] = None, url: Optional[str] = None,
+               text: Optional[str] = None) -> str:
+    """Stable key: the source's own id when it has one, otherwise a hash of the URL (or text)."""
+    if native_id:
+        return f"{source}:{native_id}"
+    basis = url.strip().rstrip("/").lower() if url else " ".join((text or "").split())
+    return f"{source}:{hashlib.sha1(basis.encode('utf-8')).hexdigest()}"
+
+
+class MentionStore:
+    """
+    Deduplicated local store of fetched mentions (tweets, pages, search hits).
+
+    Rows are keyed by ``mention_id`` and upserted, so re-fetching the same item
+    refreshes it instead of duplicating it. ``(brand, ts)`` and ``(source, ts)``
+    indexes keep range scans cheap; scans page through results with a keyset on
+    ``(ts, id)`` instead of OFFSET.
+    """
+
+    def __init__(self, db_path: Optional[str] = MENTION_STORE_DB):
+        self.db_path = db_path or ":memory:"
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mentions ("
+                "id TEXT PRIMARY KEY, source TEXT NOT NULL, brand TEXT NOT NULL, ts REAL NOT NULL, "
+                "fetched_at REAL NOT NULL, author TEXT, url TEXT, text TEXT NOT NULL, payload TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mentions_brand_ts ON mentions (brand, ts, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mentions_source_ts ON mentions (source, ts, id)")
+            self._conn.commit()
+        return self._conn
+
+    def upsert_many(self, mentions: List[Dict[str, Any]]) -> int:
+        """
+        Insert or refresh mentions; returns how many were new.
+
+        Each mention needs ``source``, ``brand`` and ``text``; ``id`` defaults to
+        ``mention_id(source, native_id, url, text)`` and ``ts`` to the fetch time.
+        Anything under ``payload`` is kept as JSON.
+        """
+        now = time.time()
+        rows = {}
+        for m in mentions:
+            key = m.get("id") or mention_id(m["source"], m.get("native_id"), m.get("url"), m["text"])
+            rows[key] = (
+                key, m["source"], m["brand"].lower(), m.get("ts") or now, now, m.get("author"),
+                m.get("url"), m["text"], json.dumps(m.get("payload"), ensure_ascii=False, default=str)
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            keys = list(rows)
+            existing = set()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                existing.update(r[0] for r in conn.execute(
+                    f"SELECT id FROM mentions WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            conn.executemany(
+                "INSERT INTO mentions (id, source, brand, ts, fetched_at, author, url, text, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET fetched_at = excluded.fetched_at, text = excluded.text, "
+                "author = excluded.author, url = excluded.url, payload = excluded.payload",
+                list(rows.values())
+            )
+            conn.commit()
+        inserted = len(rows) - len(existing)
+        logger.info(f"Mention store: {inserted} new, {len(existing)} refreshed")
+        return inserted
+
+    @staticmethod
+    def _filters(brand: Optional[str], source: Optional[str], since: Optional[float],
+                 until: Optional[float], fetched_since: Optional[float] = None):
+        clauses, params = [], []
+        if brand is not None:
+            clauses.append("brand = ?")
+            params.append(brand.lower())
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if fetched_since is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(fetched_since)
+        return clauses, params
+
+    def scan(self, brand: Optional[str] = None, source: Optional[str] = None, since: Optional[float] = None,
+             until: Optional[float] = None, batch_size: int = 500,
+             fetched_since: Optional[float] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Batches of mentions in ``[since, until)`` ordered by timestamp, optionally only recently fetched ones."""
+        clauses, params = self._filters(brand, source, since, until, fetched_since)
+        after = None
+        while True:
+            page_clauses, page_params = list(clauses), list(params)
+            if after is not None:
+                page_clauses.append("(ts, id) > (?, ?)")
+                page_params.extend(after)
+            where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT id, source, brand, ts, fetched_at, author, url, text, payload FROM mentions "
+                    f"{where} ORDER BY ts, id LIMIT ?", page_params + [batch_size]
+                ).fetchall()
+            if not rows:
+                return
+            yield [
+                {"id": r[0], "source": r[1], "brand": r[2], "ts": r[3], "fetched_at": r[4], "author": r[5],
+                 "url": r[6], "text": r[7], "payload": json.loads(r[8]) if r[8] else None}
+                for r in rows
+            ]
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][3], rows[-1][0])
+
+    def iter_texts(self, brand: Optional[str] = None, source: Optional[str] = None,
+                   since: Optional[float] = None, until: Optional[float] = None) -> Iterator[str]:
+        """Mention texts only, streamed from ``scan`` (e.g. into ``analyze_stream``)."""
+        for batch in self.scan(brand, source, since, until):
+            for mention in batch:
+                yield mention["text"]
+
+    def count(self, brand: Optional[str] = None, source: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None) -> int:
+        clauses, params = self._filters(brand, source, since, until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM mentions {where}", params).fetchone()[0]
+
+
+# Shared by the fetch tools and downstream analysis stages
+mention_store = MentionStore()
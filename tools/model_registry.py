@@ -0,0 +1,109 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Any
+from transformers import pipeline
+
+logger = logging.getLogger(__name__)
+
+# Pipelines used by the sentiment stack, keyed by registry name
+MODEL_SPECS = {
+    "primary": {"task": "sentiment-analysis", "model": "distilbert-base-uncased-finetuned-sst-2-english"},
+    "fallback": {"task": "sentiment-analysis", "model": "nlptown/bert-base-multilingual-uncased-sentiment"},
+    "emotion": {"task": "text-classification", "model": "j-hartmann/emotion-english-distilroberta-base"},
+    "aspect": {"task": "zero-shot-classification", "model": "facebook/bart-large-mnli"},
+}
+
+
+class ModelRegistry:
+    """
+    Process-wide, lazily populated cache of inference pipelines.
+
+    A pipeline is built the first time ``get`` asks for it and the same instance is
+    handed to every caller afterwards. When ``max_loaded`` is set, the least recently
+    used entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, specs: Optional[Dict[str, Dict[str, str]]] = None, max_loaded: Optional[int] = None):
+        self.specs = dict(specs or MODEL_SPECS)
+        self.max_loaded = max_loaded
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"loads": 0, "hits": 0, "evictions": 0, "load_seconds": {}}
+
+    def register(self, key: str, loader: Callable[[], Any]):
+        """Register a custom loader, e.g. for an alternative inference backend."""
+        with self._lock:
+            self._loaders[key] = loader
+
+    def _load(self, key: str) -> Any:
+        if key in self._loaders:
+            return self._loaders[key]()
+        if key not in self.specs:
+            raise KeyError(f"Unknown model '{key}'")
+        spec = self.specs[key]
+        return pipeline(spec["task"], model=spec["model"], device=-1)  # Force CPU
+
+    def get(self, key: str) -> Any:
+        """Return the shared instance for ``key``, loading it on first use."""
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._models[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available meanwhile
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._stats["hits"] += 1
+                    return self._models[key]
+            start = time.perf_counter()
+            model = self._load(key)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._models[key] = model
+                self._stats["loads"] += 1
+                self._stats["load_seconds"][key] = round(elapsed, 3)
+                logger.info(f"Loaded model '{key}' in {elapsed:.2f}s")
+                if self.max_loaded:
+                    while len(self._models) > self.max_loaded:
+                        self._evict_lru()
+            return model
+
+    def _evict_lru(self):
+        evicted, _ = self._models.popitem(last=False)
+        self._stats["evictions"] += 1
+        logger.info(f"Evicted model '{evicted}'")
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def evict(self, key: Optional[str] = None):
+        """Drop one model (or all of them when ``key`` is None)."""
+        with self._lock:
+            keys = [key] if key else list(self._models)
+            for k in keys:
+                if self._models.pop(k, None) is not None:
+                    self._stats["evictions"] += 1
+                    logger.info(f"Evicted model '{k}'")
+
+    def stats(self) -> Dict[str, Any]:
+        """Load, hit and eviction counters plus the currently loaded models."""
+        with self._lock:
+            return {
+                "loaded": list(self._models),
+                "loads": self._stats["loads"],
+                "hits": self._stats["hits"],
+                "evictions": self._stats["evictions"],
+                "load_seconds": dict(self._stats["load_seconds"]),
+            }
+
+
+# Shared by every SentimentAnalysisTool in the process
+registry = ModelRegistry()
@@ -1,23 +1,34 @@
 import os
+import asyncio
 import requests
+import httpx
 import json
 import logging
 from crewai.tools import BaseTool
-from langchain_community.document_loaders import WebBaseLoader
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union, Any
 import time
+from concurrent.futures import ThreadPoolExecutor
+from tools.mention_store import mention_store, UNKNOWN_BRAND
+from tools.http_clients import http_clients
+from tools.response_cache import response_cache
+from tools.outbound_governor import outbound_governor, OutboundUnavailable
+from tools.page_fetcher import fetch_pages, MAX_PAGE_BYTES, MAX_PAGE_TOKENS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+# Failures of a (possibly collapsed) sync or async Serper request
+FETCH_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError, OutboundUnavailable)
+
 class SearchToolBase(BaseTool):
     """Base class for search tools to share common functionality."""
     name: str = "base_search_tool"
     description: str = "Base tool for search operations."
 
     max_retries: int = 3
-    retry_delay: int = 2
+    retry_delay: float = 2  # base of the exponential backoff, in seconds
 
     @property
     def api_key(self) -> Optional[str]:
@@ -28,37 +39,143 @@ class SearchToolBase(BaseTool):
             raise ValueError("SERPER_API_KEY is required.")
         return api_key
 
-    def _api_request(self, url: str, payload: Dict, retries: int = 0) -> Dict:
-        """Perform API request with retry logic."""
+    def _fetch(self, url: str, payload: Dict) -> Dict:
+        """Perform API request through the outbound governor; raises once retries are exhausted."""
+        headers = {
+            'X-API-KEY': self.api_key,
+            'Content-Type': 'application/json'
+        }
+
+        def post():
+            # Pooled keep-alive session shared by all Serper tools; timeouts come from its provider settings
+            response = http_clients.session("serper").post(url, headers=headers, data=json.dumps(payload))
+            response.raise_for_status()
+            return response.json()
+
+        # Rate limited, retried with jittered exponential backoff, and failed fast while Serper is down
+        return outbound_governor.call(
+            "serper", post, retry_on=(requests.exceptions.RequestException,),
+            max_retries=self.max_retries, base_delay=self.retry_delay
+        )
+
+    def _api_request(self, url: str, payload: Dict) -> Dict:
+        """Cached API request: identical queries within the Serper TTL are answered from the response cache."""
         try:
-            headers = {
-                'X-API-KEY': self.api_key,
-                'Content-Type': 'application/json'
-            }
-            response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=10)
+            return response_cache.get_or_fetch("serper", url, payload, lambda: self._fetch(url, payload), tool=self.name)
+        except FETCH_ERRORS as e:
+            logger.error(f"API request failed: {str(e)}")
+            return {"organic": []}
+
+    async def _fetch_async(self, client: httpx.AsyncClient, url: str, payload: Dict) -> Dict:
+        """Async counterpart of ``_fetch``; backoff and rate-limit waits yield to the event loop."""
+        headers = {
+            'X-API-KEY': self.api_key,
+            'Content-Type': 'application/json'
+        }
+
+        async def post():
+            response = await client.post(url, headers=headers, content=json.dumps(payload))
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
-            if retries < self.max_retries:
-                logger.warning(f"API request failed (attempt {retries + 1}/{self.max_retries}): {str(e)}. Retrying...")
-                time.sleep(self.retry_delay)
-                return self._api_request(url, payload, retries + 1)
-            logger.error(f"API request failed after {self.max_retries} retries: {str(e)}")
+
+        return await outbound_governor.acall(
+            "serper", post, retry_on=(httpx.HTTPError,), max_retries=self.max_retries, base_delay=self.retry_delay
+        )
+
+    async def _api_request_async(self, client: httpx.AsyncClient, url: str, payload: Dict) -> Dict:
+        """Async counterpart of ``_api_request``, with the same cache and in-flight collapsing."""
+        try:
+            return await response_cache.aget_or_fetch(
+                "serper", url, payload, lambda: self._fetch_async(client, url, payload), tool=self.name
+            )
+        except FETCH_ERRORS as e:
+            logger.error(f"API request failed: {str(e)}")
             return {"organic": []}
 
+    async def search_many_async(self, queries: List[Union[str, Dict[str, str]]], max_concurrency: int = 5,
+                                num: int = 5, url: str = SERPER_SEARCH_URL) -> Dict[str, Any]:
+        """
+        Run many Serper queries concurrently.
+
+        Args:
+            queries: Query strings, or ``{"q": ..., "site": ...}`` dicts to restrict a query to a site.
+            max_concurrency: Maximum number of requests in flight.
+            num: Results per query.
+
+        Returns:
+            dict: ``results`` in input order (query, site, organic hits, seconds), plus the batch
+            ``wall_seconds`` and ``sum_seconds`` (what running the queries one by one would have cost).
+        """
+        specs = [{"q": q} if isinstance(q, str) else dict(q) for q in queries]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        connect, read = http_clients.settings["serper"]["timeout"]
+        limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+
+        async def run(client, spec):
+            query = f"site:{spec['site']} {spec['q']}" if spec.get("site") else spec["q"]
+            payload = {"q": query, "num": num}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await self._api_request_async(client, url, payload)
+                return {
+                    "query": spec["q"],
+                    "site": spec.get("site"),
+                    "organic": response.get("organic", []),
+                    "seconds": time.perf_counter() - start
+                }
+
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=httpx.Timeout(read, connect=connect), limits=limits) as client:
+            results = await asyncio.gather(*(run(client, spec) for spec in specs))
+        wall = time.perf_counter() - start
+        logger.info(f"Ran {len(specs)} searches in {wall:.2f}s (sequential estimate {sum(r['seconds'] for r in results):.2f}s)")
+        return {
+            "results": list(results),
+            "wall_seconds": wall,
+            "sum_seconds": sum(r["seconds"] for r in results)
+        }
+
+    def search_many(self, queries: List[Union[str, Dict[str, str]]], max_concurrency: int = 5,
+                    num: int = 5) -> Dict[str, Any]:
+        """Blocking wrapper around ``search_many_async``, usable with or without a running event loop."""
+        coroutine = self.search_many_async(queries, max_concurrency, num)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Already inside an event loop (e.g. an async crew): run the batch on its own loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    def _store_results(self, results: List[Dict], source: str, brand: Optional[str]):
+        """Keep organic hits in the mention store, keyed by link, under ``brand`` (not the query)."""
+        brand = brand or UNKNOWN_BRAND
+        mention_store.upsert_many([
+            {
+                "source": source,
+                "url": result.get("link"),
+                "brand": brand,
+                "text": f"{result.get('title', '')}\n{result.get('snippet', '')}".strip(),
+                "payload": result
+            }
+            for result in results if result.get("link")
+        ])
+
 class InternetSearchTool(SearchToolBase):
     name: str = "search_internet"
     description: str = (
         "Search the internet using Google for information. "
-        "Returns up to 5 results with titles, snippets, and links."
+        "Returns up to 5 results with titles, snippets, and links. "
+        "Pass the monitored brand as `brand` so the results are filed under it."
     )
 
-    def _run(self, query: str) -> str:
+    def _run(self, query: str, brand: Optional[str] = None) -> str:
         """
         Search the internet for information.
 
         Args:
             query (str): The search query.
+            brand (Optional[str]): Brand the results are stored under.
 
         Returns:
             str: Formatted search results.
@@ -67,10 +184,11 @@ class InternetSearchTool(SearchToolBase):
             logger.error("Invalid search query.")
             return "Error: Invalid search query."
         
-        url = "https://google.serper.dev/search"
+        url = SERPER_SEARCH_URL
         payload = {"q": query, "num": 5}
         response = self._api_request(url, payload)
         results = response.get("organic", [])
+        self._store_results(results, "serper_search", brand)
 
         formatted_results = []
         for result in results:
@@ -83,15 +201,17 @@ class InstagramSearchTool(SearchToolBase):
     name: str = "search_instagram"
     description: str = (
         "Search Instagram pages using Google by filtering site:instagram.com. "
-        "Returns up to 5 results with titles, snippets, and links."
+        "Returns up to 5 results with titles, snippets, and links. "
+        "Pass the monitored brand as `brand` so the results are filed under it."
     )
 
-    def _run(self, query: str) -> str:
+    def _run(self, query: str, brand: Optional[str] = None) -> str:
         """
         Search Instagram for information.
 
         Args:
             query (str): The search query.
+            brand (Optional[str]): Brand the results are stored under.
 
         Returns:
             str: Formatted search results.
@@ -100,10 +220,11 @@ class InstagramSearchTool(SearchToolBase):
             logger.error("Invalid search query.")
             return "Error: Invalid search query."
         
-        url = "https://google.serper.dev/search"
+        url = SERPER_SEARCH_URL
         payload = {"q": f"site:instagram.com {query}", "num": 5}
         response = self._api_request(url, payload)
         results = response.get("organic", [])
+        self._store_results(results, "serper_instagram", brand)
 
         formatted_results = []
         for result in results:
@@ -112,30 +233,102 @@ class InstagramSearchTool(SearchToolBase):
             )
         return f"Instagram search results for '{query}':\n\n" + "".join(formatted_results) if formatted_results else "No results found."
 
+class MultiSearchTool(SearchToolBase):
+    name: str = "search_many"
+    description: str = (
+        "Run several Google searches at once, optionally also restricted to sites such as instagram.com. "
+        "Returns up to 5 results per query with titles, snippets, and links. "
+        "Pass the monitored brand as `brand` so the results are filed under it."
+    )
+
+    max_concurrency: int = 5
+
+    def _format(self, batch: Dict[str, Any]) -> str:
+        sections = []
+        for result in batch["results"]:
+            label = f"{result['query']} (site:{result['site']})" if result["site"] else result["query"]
+            hits = "".join(
+                f"{hit.get('title', 'No title')}\n{hit.get('snippet', 'No snippet')}\n{hit.get('link', 'No link')}\n\n"
+                for hit in result["organic"]
+            )
+            sections.append(f"Search results for '{label}':\n\n" + (hits or "No results found.\n\n"))
+        return "".join(sections) + f"({len(batch['results'])} searches in {batch['wall_seconds']:.2f}s)"
+
+    def _store_batch(self, batch: Dict[str, Any], brand: Optional[str]):
+        for result in batch["results"]:
+            source = f"serper_{result['site'].split('.')[0]}" if result["site"] else "serper_search"
+            self._store_results(result["organic"], source, brand)
+
+    def _queries(self, queries: Union[str, List[str]], sites: Optional[List[str]]) -> List[Dict[str, str]]:
+        """Every valid query runs on the open web and once per requested site."""
+        if isinstance(queries, str):
+            queries = [queries]
+        queries = [q for q in queries if isinstance(q, str) and q.strip()]
+        return [{"q": q, **({"site": site} if site else {})} for q in queries for site in [None] + list(sites or [])]
+
+    def _run(self, queries: List[str], sites: Optional[List[str]] = None, brand: Optional[str] = None) -> str:
+        """
+        Search for several queries concurrently.
+
+        Args:
+            queries (List[str]): The search queries.
+            sites (Optional[List[str]]): Sites to also search each query on (e.g. ["instagram.com"]).
+            brand (Optional[str]): Brand the results are stored under.
+
+        Returns:
+            str: Formatted search results, grouped by query in input order.
+        """
+        specs = self._queries(queries, sites)
+        if not specs:
+            logger.error("Invalid search query.")
+            return "Error: Invalid search query."
+        batch = self.search_many(specs, self.max_concurrency)
+        self._store_batch(batch, brand)
+        return self._format(batch)
+
+    async def _arun(self, queries: List[str], sites: Optional[List[str]] = None, brand: Optional[str] = None) -> str:
+        specs = self._queries(queries, sites)
+        if not specs:
+            logger.error("Invalid search query.")
+            return "Error: Invalid search query."
+        batch = await self.search_many_async(specs, self.max_concurrency)
+        self._store_batch(batch, brand)
+        return self._format(batch)
+
 class OpenPageTool(BaseTool):
     name: str = "open_page"
     description: str = (
-        "Open a webpage and return its content."
+        "Open one or more webpages and return their main content. "
+        "Pass a single URL or a list of URLs; long pages are cut to a fixed size."
     )
 
-    def _run(self, url: str) -> str:
+    max_concurrency: int = 8
+    max_bytes: int = MAX_PAGE_BYTES
+    max_tokens: int = MAX_PAGE_TOKENS
+
+    def _run(self, url: Union[str, List[str]]) -> str:
         """
-        Open a webpage and return its content.
+        Open webpages and return their content.
 
         Args:
-            url (str): The URL of the webpage to open.
+            url (Union[str, List[str]]): The URL of the webpage to open, or a list of URLs.
 
         Returns:
-            str: Content of the webpage.
+            str: Title and main content of each page, in input order.
         """
-        if not isinstance(url, str) or not url.strip():
+        urls = [url] if isinstance(url, str) else list(url or [])
+        urls = [u.strip() for u in urls if isinstance(u, str) and u.strip()]
+        if not urls:
             logger.error("Invalid URL.")
             return "Error: Invalid URL."
-        
-        try:
-            loader = WebBaseLoader(url)
-            content = loader.load()
-            return content[0].page_content if content else "No content available."
-        except Exception as e:
-            logger.error(f"Failed to open page {url}: {str(e)}")
-            return f"Error: Failed to load page - {str(e)}"
\ No newline at end of file
+
+        # Downloaded concurrently over the pooled "web" session, revalidated against the page cache
+        pages = fetch_pages(urls, self.max_concurrency, self.max_bytes, self.max_tokens)
+        sections = []
+        for page in pages:
+            if page["status"] == "error":
+                sections.append(f"{page['url']}\nError: Failed to load page - {page['error']}")
+                continue
+            note = "\n[Content truncated]" if page["truncated"] else ""
+            sections.append(f"{page['title'] or page['url']}\n{page['url']}\n\n{page['text'] or 'No content available.'}{note}")
+        return "\n\n---\n\n".join(sections)
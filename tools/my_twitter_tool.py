@@ -1,15 +1,41 @@
 # twitter_fetch_tool.py
 import os
 import json
+import time
 import tweepy
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type
+from tools.twitter_state import twitter_cursors, search_rate_limit
+from tools.mention_store import mention_store
+from tools.http_clients import http_clients
+from tools.outbound_governor import outbound_governor, OutboundUnavailable
+
+# search_tweets returns at most 100 tweets per page
+PAGE_SIZE = 100
+
+# Authenticated clients per credential set, reused across calls and tool instances
+_api_clients = {}
+
+
+def _twitter_api(api_key: str, api_secret: str, access_token: str, access_token_secret: str) -> tweepy.API:
+    credentials = (api_key, api_secret, access_token, access_token_secret)
+    api = _api_clients.get(credentials)
+    if api is None:
+        # Authenticate with Twitter API v1.1
+        auth = tweepy.OAuthHandler(api_key, api_secret)
+        auth.set_access_token(access_token, access_token_secret)
+        # Rate limits are tracked per window instead of sleeping inside tweepy
+        api = tweepy.API(auth, wait_on_rate_limit=False, timeout=http_clients.settings["twitter"]["timeout"])
+        # tweepy closes its session after every request; the borrowed wrapper keeps the shared pool open
+        api.session = http_clients.borrowed_session("twitter")
+        _api_clients[credentials] = api
+    return api
 
 # Define the input schema for the tool
 class TwitterFetchToolSchema(BaseModel):
     brand_name: str = Field(..., description="The brand name to search for on Twitter (e.g., 'iPhone').")
-    count: int = Field(default=100, description="Number of tweets to fetch (default: 100).")
+    count: int = Field(default=100, description="Maximum number of new tweets to fetch, paginated (default: 100).")
 
 class TwitterFetchTool(BaseTool):
     name: str = "Fetch Twitter Data"
@@ -26,36 +52,106 @@ class TwitterFetchTool(BaseTool):
         if not all([api_key, api_secret, access_token, access_token_secret]):
             raise ValueError("Twitter API credentials are missing. Set TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, and TWITTER_ACCESS_TOKEN_SECRET in environment variables.")
 
-        # Authenticate with Twitter API v1.1
-        auth = tweepy.OAuthHandler(api_key, api_secret)
-        auth.set_access_token(access_token, access_token_secret)
-        api = tweepy.API(auth, wait_on_rate_limit=True)
+        api = _twitter_api(api_key, api_secret, access_token, access_token_secret)
 
+        since_id = twitter_cursors.get(brand_name)
+        # An earlier refresh that stopped short of since_id is resumed first, so no tweets are skipped
+        backfill = twitter_cursors.backfill(brand_name) if since_id is not None else None
+        tweets = []
+        pages = 0
+        exhausted = False
         try:
-            # Fetch tweets
-            tweets = api.search_tweets(
-                q=f"{brand_name} -filter:retweets",  # Exclude retweets for cleaner data
-                lang="en",  # English tweets (you can adjust this)
-                count=count,
-                tweet_mode="extended"  # Get full text of tweets
-            )
+            # Page backwards from the newest tweet (or the backfill cursor) until since_id,
+            # the volume cap or the rate window is reached
+            max_id = backfill[0] if backfill else None
+            while len(tweets) < count:
+                if search_rate_limit.available() == 0:
+                    print(f"⚠️ Search rate limit window used up; stopping after {pages} pages.")
+                    break
+                requested = min(PAGE_SIZE, count - len(tweets))
+                try:
+                    # Paced by the shared governor; 5xx errors are retried with backoff, 429s end the run
+                    page = outbound_governor.call("twitter", lambda: api.search_tweets(
+                        q=f"{brand_name} -filter:retweets",  # Exclude retweets for cleaner data
+                        lang="en",  # English tweets (you can adjust this)
+                        count=requested,
+                        since_id=since_id,
+                        max_id=max_id,
+                        tweet_mode="extended"  # Get full text of tweets
+                    ), retry_on=(tweepy.TwitterServerError,))
+                except tweepy.TooManyRequests as e:
+                    reset = e.response.headers.get("x-rate-limit-reset") if e.response is not None else None
+                    search_rate_limit.exhaust(float(reset) if reset else time.time() + 15 * 60)
+                    if tweets:
+                        break
+                    raise
+                except OutboundUnavailable as e:
+                    print(f"⚠️ Twitter calls paused ({e}); stopping after {pages} pages.")
+                    if tweets:
+                        break
+                    raise
+                finally:
+                    if getattr(api, "last_response", None) is not None:
+                        search_rate_limit.update(api.last_response.headers)
+                pages += 1
+                if not page:
+                    exhausted = True  # only an empty page means nothing older than since_id is left
+                    break
+                # Short pages are common while older matches remain, so keep paging below them
+                tweets.extend(page)
+                max_id = min(tweet.id for tweet in page) - 1
+
+            # Newest id of this pass (or of the interrupted pass being backfilled)
+            top_id = backfill[1] if backfill else max((tweet.id for tweet in tweets), default=None)
+            if exhausted or since_id is None:
+                # Paged all the way down to since_id (or this is the first fetch): the mark can move up
+                if top_id is not None:
+                    twitter_cursors.advance(brand_name, top_id)
+                if backfill:
+                    twitter_cursors.clear_backfill(brand_name)
+            elif tweets:
+                # Stopped early: keep since_id and resume below the oldest tweet fetched next time
+                twitter_cursors.set_backfill(brand_name, max_id, top_id)
 
             # Format tweets to match the expected structure
             formatted_data = {
                 "data": [
                     {
+                        "id": tweet.id_str,
+                        "created_at": tweet.created_at.isoformat(),
                         "user": tweet.user.screen_name,
                         "text": tweet.full_text,
                         "mentions": [user_mention["screen_name"] for user_mention in tweet.entities.get("user_mentions", [])]
                     }
                     for tweet in tweets
-                ]
+                ],
+                "meta": {
+                    "since_id": since_id,
+                    "backfill": backfill is not None,
+                    "complete": exhausted or since_id is None,
+                    "pages": pages,
+                    "rate_limit": search_rate_limit.status()
+                }
             }
 
-            print(f"✅ Fetched {len(tweets)} tweets for {brand_name}.")
+            # Keep the tweets for downstream stages instead of only in the transcript
+            mention_store.upsert_many([
+                {
+                    "source": "twitter",
+                    "native_id": item["id"],
+                    "brand": brand_name,
+                    "ts": tweet.created_at.timestamp(),
+                    "author": item["user"],
+                    "text": item["text"],
+                    "payload": item
+                }
+                for tweet, item in zip(tweets, formatted_data["data"])
+            ])
+
+            print(f"✅ Fetched {len(tweets)} new tweets for {brand_name} in {pages} pages.")
             return json.dumps(formatted_data)
 
-        except tweepy.TweepyException as e:
+        except (tweepy.TweepyException, OutboundUnavailable) as e:
             print(f"⚠️ Error fetching Twitter data: {e}")
             # Fallback to mock data in case of failure
             mock_data = {
@@ -0,0 +1,125 @@
+import os
+import json
+import logging
+from typing import Dict, List, Optional, Union, Any
+import numpy as np
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+except ImportError:  # optional dependency, only needed for backend="onnx"
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+# Where exported and quantized models are cached between runs
+ONNX_CACHE_DIR = os.getenv("SENTIMENT_ONNX_DIR", os.path.join("db", "onnx"))
+
+
+class OnnxTextClassifier:
+    """
+    Drop-in replacement for a transformers text-classification pipeline backed by
+    a dynamically int8-quantized ONNX Runtime session.
+
+    The first use exports the Hugging Face model to ONNX, quantizes it and stores
+    both files plus the tokenizer under ``cache_dir``; later processes load the
+    cached artifacts directly. Calling the object mirrors the pipeline: a string
+    returns ``[{"label", "score"}]`` and a list returns one such dict per text.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = ONNX_CACHE_DIR,
+                 intra_op_threads: Optional[int] = None, max_length: int = 512):
+        if ort is None:
+            raise ImportError("onnxruntime is required for the ONNX backend. Install it with 'pip install onnxruntime onnx'.")
+        self.model_name = model_name
+        self.model_dir = os.path.join(cache_dir, model_name.replace("/", "--"))
+        self.quantized_path = os.path.join(self.model_dir, "model.int8.onnx")
+        if not os.path.exists(self.quantized_path):
+            self._export()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        self.max_length = min(max_length, self.tokenizer.model_max_length or max_length)
+        with open(os.path.join(self.model_dir, "labels.json"), "r", encoding="utf-8") as f:
+            self.id2label = {int(k): v for k, v in json.load(f).items()}
+
+        options = ort.SessionOptions()
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.quantized_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _export(self):
+        """Export the PyTorch model to ONNX and quantize its weights to int8."""
+        import torch
+
+        os.makedirs(self.model_dir, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name).eval()
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask") if name in sample]
+        float_path = os.path.join(self.model_dir, "model.onnx")
+
+        logger.info(f"Exporting {self.model_name} to ONNX at {float_path}")
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            float_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in input_names}, "logits": {0: "batch"}},
+            opset_version=14,
+            dynamo=False
+        )
+        quantize_dynamic(float_path, self.quantized_path, weight_type=QuantType.QInt8)
+        tokenizer.save_pretrained(self.model_dir)
+        with open(os.path.join(self.model_dir, "labels.json"), "w", encoding="utf-8") as f:
+            json.dump({str(k): v for k, v in model.config.id2label.items()}, f)
+        logger.info(f"Quantized {self.model_name} to {self.quantized_path}")
+
+    def forward(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Raw logits for an already tokenized and padded batch."""
+        feeds = {"input_ids": input_ids.astype(np.int64), "attention_mask": attention_mask.astype(np.int64)}
+        return self.session.run(["logits"], {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+    def __call__(self, inputs: Union[str, List[str]], batch_size: int = 32, top_k: Optional[int] = 1,
+                 **kwargs) -> List[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_length, return_tensors="np"
+            )
+            logits = self.forward(encoded["input_ids"], encoded["attention_mask"])
+            # Same softmax the pipeline applies for single-label classifiers
+            exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            probs = exp / exp.sum(axis=-1, keepdims=True)
+            if top_k == 1:
+                best = probs.argmax(axis=-1)
+                results.extend(
+                    {"label": self.id2label[int(i)], "score": float(p[i])} for i, p in zip(best, probs)
+                )
+            else:
+                ranked = np.argsort(-probs, axis=-1)[:, :top_k]
+                results.extend(
+                    [{"label": self.id2label[int(i)], "score": float(p[i])} for i in order]
+                    for order, p in zip(ranked, probs)
+                )
+        return results
+
+
+def agreement_report(reference, candidate, texts: List[str], batch_size: int = 32) -> Dict[str, Any]:
+    """Compare labels from a reference pipeline and a candidate backend on ``texts``."""
+    expected = reference(texts, batch_size=batch_size)
+    actual = candidate(texts, batch_size=batch_size)
+    mismatches = [i for i, (e, a) in enumerate(zip(expected, actual)) if e["label"] != a["label"]]
+    score_deltas = [abs(e["score"] - a["score"]) for e, a in zip(expected, actual)]
+    return {
+        "texts": len(texts),
+        "label_disagreements": len(mismatches),
+        "disagreement_rate": len(mismatches) / len(texts) if texts else 0.0,
+        "mean_score_delta": float(np.mean(score_deltas)) if score_deltas else 0.0,
+        "mismatched_examples": [texts[i] for i in mismatches[:5]]
+    }
@@ -0,0 +1,311 @@
+import asyncio
+import random
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+import httpx
+import numpy as np
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Sustained requests per second and burst size per provider
+PROVIDER_LIMITS: Dict[str, Dict[str, float]] = {
+    "serper": {"rate": 5.0, "burst": 10},
+    "exa": {"rate": 2.0, "burst": 4},
+    "twitter": {"rate": 180 / 900, "burst": 10},  # 180 searches per 15-minute window
+    "firecrawl": {"rate": 1.0, "burst": 2},
+    "web": {"rate": 10.0, "burst": 20},
+}
+DEFAULT_LIMITS = {"rate": 2.0, "burst": 4}
+
+
+class OutboundUnavailable(Exception):
+    """A call was not sent because the provider is rate limited or failing."""
+
+
+class CircuitOpenError(OutboundUnavailable):
+    pass
+
+
+class RateLimitTimeout(OutboundUnavailable):
+    pass
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations: each caller takes a token immediately and
+    is told how long to wait for it, so concurrent callers queue in order
+    without holding the lock while they wait.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Reserve one token; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise RateLimitTimeout(f"would wait {wait:.1f}s for a token (limit {max_wait:.1f}s)")
+            self._tokens -= 1
+            return wait
+
+    def available(self) -> float:
+        with self._lock:
+            return min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls for
+    ``reset_timeout`` seconds; then lets one trial call through (half-open) and
+    closes again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial:
+                return False
+            self._trial = True  # only one trial call while half-open
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self):
+        """End a half-open trial without a verdict (e.g. the call failed for an unrelated reason)."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+# Failures on the way to or from the server; anything else raised without a response
+# (a malformed URL or header, an undecodable body) would fail the same way again
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError,
+    httpx.TransportError, ConnectionError, TimeoutError,
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Connection errors, timeouts, 429 and 5xx are worth retrying; client-side errors and other 4xx are not."""
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    # Client libraries (e.g. tweepy) wrap transport errors in their own exception types
+    while error is not None:
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OutboundGovernor:
+    """
+    Shared gate for every outbound API call made by the tools.
+
+    Each provider gets a token bucket (``PROVIDER_LIMITS``) and a circuit
+    breaker. ``call`` / ``acall`` wait for a token, fail fast with
+    ``CircuitOpenError`` while the provider's breaker is open, and retry
+    retryable errors with jittered exponential backoff (honouring
+    ``Retry-After``). The async variant never blocks the event loop; the sync
+    one runs on agent threads, so it waits at most ``max_sync_wait`` seconds
+    for a token or a retry and otherwise fails fast with ``RateLimitTimeout``.
+    Token waits are recorded so ``stats`` can report queue-wait percentiles.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None, max_retries: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 8.0, max_wait: float = 30.0, max_sync_wait: float = 2.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, latency_window: int = 1024):
+        self.limits = {k: dict(v) for k, v in (limits or PROVIDER_LIMITS).items()}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.max_sync_wait = max_sync_wait
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_window = latency_window
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._waits: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, rate: Optional[float] = None, burst: Optional[float] = None):
+        with self._lock:
+            limits = self.limits.setdefault(provider, dict(DEFAULT_LIMITS))
+            if rate is not None:
+                limits["rate"] = rate
+            if burst is not None:
+                limits["burst"] = burst
+            self._buckets.pop(provider, None)
+
+    def _provider(self, provider: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        with self._lock:
+            if provider not in self._buckets:
+                limits = self.limits.setdefault(provider, dict(DEFAULT_LIMITS))
+                self._buckets[provider] = TokenBucket(limits["rate"], limits["burst"])
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._waits[provider] = deque(maxlen=self.latency_window)
+                self._stats[provider] = {"calls": 0, "retries": 0, "failures": 0, "rejected": 0}
+            return self._buckets[provider], self._breakers[provider]
+
+    def _admit(self, provider: str, max_wait: float) -> float:
+        """Check the breaker and reserve a token; returns the seconds to wait for it."""
+        bucket, breaker = self._provider(provider)
+        if not breaker.allow():
+            self._stats[provider]["rejected"] += 1
+            raise CircuitOpenError(f"{provider} circuit is open after repeated failures")
+        try:
+            wait = bucket.reserve(max_wait)
+        except RateLimitTimeout:
+            breaker.release()
+            self._stats[provider]["rejected"] += 1
+            raise
+        self._waits[provider].append(wait)
+        self._stats[provider]["calls"] += 1
+        return wait
+
+    def _backoff(self, attempt: int, error: BaseException, base_delay: Optional[float], max_delay: float) -> float:
+        # Full jitter: uniform in [0, base * 2^attempt], capped
+        delay = random.uniform(0, min(max_delay, (base_delay or self.base_delay) * 2 ** attempt))
+        retry_after = _retry_after(error)
+        return min(max(delay, retry_after), self.max_delay) if retry_after is not None else delay
+
+    def _failed(self, provider: str, error: BaseException, attempt: int, retries: int,
+                retry_on: Tuple[Type[BaseException], ...]) -> bool:
+        """Record a failed attempt; returns True if it should be retried."""
+        _, breaker = self._provider(provider)
+        if not isinstance(error, retry_on) or not is_retryable(error):
+            breaker.release()
+            return False
+        breaker.record_failure()
+        self._stats[provider]["failures"] += 1
+        if attempt >= retries or breaker.state == "open":
+            return False
+        self._stats[provider]["retries"] += 1
+        logger.warning(f"{provider} request failed (attempt {attempt + 1}/{retries}): {str(error)}. Retrying...")
+        return True
+
+    def call(self, provider: str, fn: Callable[[], Any], retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+             max_retries: Optional[int] = None, base_delay: Optional[float] = None) -> Any:
+        """
+        Run ``fn()`` under the provider's rate limit, breaker and retry policy.
+
+        Raises ``RateLimitTimeout`` instead of blocking the calling thread for more
+        than ``max_sync_wait`` seconds on a token or a ``Retry-After`` backoff.
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            wait = self._admit(provider, self.max_sync_wait)
+            if wait:
+                time.sleep(wait)
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._failed(provider, e, attempt, retries, retry_on):
+                    raise
+                delay = self._backoff(attempt, e, base_delay, min(self.max_delay, self.max_sync_wait))
+                if delay > self.max_sync_wait:
+                    self._stats[provider]["rejected"] += 1
+                    raise RateLimitTimeout(f"{provider} asked to retry after {delay:.1f}s") from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._breakers[provider].record_success()
+            return result
+
+    async def acall(self, provider: str, fn: Callable[[], Awaitable[Any]],
+                    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                    max_retries: Optional[int] = None, base_delay: Optional[float] = None) -> Any:
+        """Async counterpart of ``call``: waits and backoffs yield to the event loop."""
+        retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            wait = self._admit(provider, self.max_wait)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self._failed(provider, e, attempt, retries, retry_on):
+                    raise
+                await asyncio.sleep(self._backoff(attempt, e, base_delay, self.max_delay))
+                attempt += 1
+                continue
+            self._breakers[provider].record_success()
+            return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Calls, retries, failures, rejections, breaker state and token queue-wait percentiles (ms) per provider."""
+        report = {}
+        for provider, stats in list(self._stats.items()):
+            waits = np.array(self._waits[provider]) * 1000
+            report[provider] = {
+                **stats,
+                "breaker": self._breakers[provider].state,
+                "tokens": round(self._buckets[provider].available(), 2),
+                "queue_wait_ms": {
+                    "p50": float(np.percentile(waits, 50)) if waits.size else 0.0,
+                    "p95": float(np.percentile(waits, 95)) if waits.size else 0.0,
+                    "max": float(waits.max()) if waits.size else 0.0,
+                },
+            }
+        return report
+
+
+# Shared by every outbound tool in the process
+outbound_governor = OutboundGovernor()
@@ -0,0 +1,263 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Any
+import requests
+from tools.http_clients import http_clients
+from tools.outbound_governor import outbound_governor
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_DB = os.getenv("PAGE_CACHE_DB", os.path.join("db", "page_cache.db"))
+
+# Bytes read per page before the download is cut off, and tokens of extracted text returned per page
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MAX_PAGE_TOKENS = 2000
+# Rough size of an LLM token in characters, used to budget extracted text
+CHARS_PER_TOKEN = 4
+
+HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+SKIP_TAGS = {"script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "iframe", "template"}
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre", "td", "th", "dd", "dt", "figcaption"}
+MAIN_TAGS = {"article", "main"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class _MainContentParser(HTMLParser):
+    """Collects the title and block-level text, separately for text inside <article>/<main>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.blocks: List[str] = []
+        self.main_blocks: List[str] = []
+        self._stack: List[str] = []
+        self._skip = 0
+        self._main = 0
+        self._in_title = False
+        self._buffer: List[str] = []
+
+    def _flush(self):
+        text = " ".join("".join(self._buffer).split())
+        self._buffer = []
+        if text:
+            self.blocks.append(text)
+            if self._main:
+                self.main_blocks.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self._stack.append(tag)
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in MAIN_TAGS:
+            self._main += 1
+        elif tag == "title":
+            self._in_title = True
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+        # Close any unclosed children too (e.g. a <p> ended by its parent)
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in SKIP_TAGS:
+                self._skip -= 1
+            elif open_tag in MAIN_TAGS:
+                if not self._skip:
+                    self._flush()
+                self._main -= 1
+            elif open_tag == "title":
+                self._in_title = False
+            if open_tag in BLOCK_TAGS and not self._skip:
+                self._flush()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_main_content(html: str) -> Dict[str, str]:
+    """
+    Title and readable text of a page: block-level text outside scripts,
+    navigation, headers and footers, taken from <article>/<main> when the page
+    has a substantial one.
+    """
+    parser = _MainContentParser()
+    parser.feed(html)
+    parser.close()
+    main = "\n".join(parser.main_blocks)
+    text = main if len(main) >= 200 else "\n".join(parser.blocks)
+    return {"title": " ".join(parser.title.split()), "text": text}
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly ``max_tokens`` tokens, at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return re.sub(r"\s+\S*$", "", cut) + " …"
+
+
+class PageCache:
+    """
+    Extracted page text with its ``ETag`` / ``Last-Modified`` validators, in SQLite.
+
+    Pages are revalidated with conditional requests: an unchanged page answers
+    304 with no body and is served from here.
+    """
+
+    def __init__(self, db_path: Optional[str] = PAGE_CACHE_DB):
+        self.db_path = db_path or ":memory:"
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, title TEXT, content TEXT NOT NULL, "
+                "truncated INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT etag, last_modified, title, content, truncated, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "title": row[2], "text": row[3],
+                "truncated": bool(row[4]), "fetched_at": row[5]}
+
+    def put(self, url: str, page: Dict[str, Any]):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, title, content, truncated, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, page.get("etag"), page.get("last_modified"), page.get("title"), page["text"],
+                 int(page.get("truncated", False)), time.time())
+            )
+            conn.commit()
+
+    def touch(self, url: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+
+
+def _charset(content_type: str) -> str:
+    match = re.search(r"charset=([\w-]+)", content_type, re.IGNORECASE)
+    return match.group(1) if match else "utf-8"
+
+
+def fetch_page(url: str, max_bytes: int = MAX_PAGE_BYTES, cache: Optional[PageCache] = None) -> Dict[str, Any]:
+    """
+    Fetch one page over the pooled "web" session and extract its main content.
+
+    The request is conditional when the page is cached; the body is streamed
+    and the download stops after ``max_bytes``. Returns the url, title, text,
+    ``status`` ("fetched", "not_modified" or "error") and whether the body was
+    truncated.
+    """
+    cache = cache if cache is not None else page_cache
+    cached = cache.get(url)
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    def download():
+        with http_clients.session("web").get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                return response, None, False
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "text/html")
+            if content_type.split(";")[0].strip().lower() not in HTML_TYPES:
+                raise ValueError(f"unsupported content type {content_type}")
+            chunks, size, truncated = [], 0, False
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    truncated = True  # leave the rest of the body unread
+                    break
+            body = b"".join(chunks)[:max_bytes].decode(_charset(content_type), errors="replace")
+            return response, body, truncated
+
+    try:
+        response, body, truncated = outbound_governor.call(
+            "web", download, retry_on=(requests.exceptions.RequestException,)
+        )
+    except Exception as e:
+        logger.error(f"Failed to open page {url}: {str(e)}")
+        return {"url": url, "status": "error", "error": str(e)}
+
+    if body is None:
+        if cached is None:
+            return {"url": url, "status": "error", "error": "304 Not Modified without a cached copy"}
+        cache.touch(url)
+        return {"url": url, "status": "not_modified", "title": cached["title"], "text": cached["text"],
+                "truncated": cached["truncated"]}
+
+    page = {
+        **extract_main_content(body),
+        "url": url,
+        "status": "fetched",
+        "truncated": truncated,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if page["etag"] or page["last_modified"]:
+        cache.put(url, page)
+    return page
+
+
+def fetch_pages(urls: List[str], max_concurrency: int = 8, max_bytes: int = MAX_PAGE_BYTES,
+                max_tokens: int = MAX_PAGE_TOKENS) -> List[Dict[str, Any]]:
+    """Fetch several pages concurrently; results come back in input order, text capped at ``max_tokens``."""
+    urls = list(dict.fromkeys(urls))
+    workers = max(1, min(max_concurrency, len(urls), http_clients.settings["web"]["pool_size"]))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pages = list(executor.map(lambda url: fetch_page(url, max_bytes), urls))
+    for page in pages:
+        if page.get("text") is not None:
+            capped = truncate_tokens(page["text"], max_tokens)
+            page["truncated"] = page["truncated"] or capped != page["text"]
+            page["text"] = capped
+    logger.info(f"Fetched {len(urls)} pages in {time.perf_counter() - start:.2f}s "
+                f"({sum(p['status'] == 'not_modified' for p in pages)} unchanged)")
+    return pages
+
+
+# Shared by every page-opening tool in the process
+page_cache = PageCache()
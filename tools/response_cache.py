@@ -0,0 +1,230 @@
+import os
+import json
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import time
+import logging
+import unicodedata
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB", os.path.join("db", "response_cache.db"))
+
+# Seconds a cached response stays fresh, per provider
+RESPONSE_TTLS = {
+    "serper": 60 * 60,
+    "exa": 6 * 60 * 60,
+    "firecrawl": 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical payload form: NFC, collapsed whitespace, case-folded text (URLs keep their case)."""
+    if isinstance(value, str):
+        text = " ".join(unicodedata.normalize("NFC", value).split())
+        return text if text.startswith(("http://", "https://")) else text.casefold()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(provider: str, endpoint: str, payload: Any) -> str:
+    canonical = json.dumps(_normalize(payload), sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(f"{provider}\n{endpoint}\n{canonical}".encode("utf-8")).hexdigest()
+    return f"{provider}:{digest}"
+
+
+class ResponseCache:
+    """
+    Shared TTL cache of paid API responses (Serper, Exa, Firecrawl).
+
+    Entries are keyed on provider, endpoint and normalized payload and stored in
+    SQLite, so identical queries from different agents, crews and dashboard
+    refreshes are answered locally until their provider's TTL runs out.
+    Concurrent identical requests are collapsed: only the first goes out and the
+    others wait for its result. Once the file holds more than ``max_bytes`` of
+    responses, expired and then least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: Optional[str] = RESPONSE_CACHE_DB, max_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.db_path = db_path or ":memory:"
+        self.max_bytes = max_bytes
+        self.ttls = dict(RESPONSE_TTLS if ttls is None else ttls)
+        self._conn = None
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, provider TEXT NOT NULL, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_access ON response_cache (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def _count(self, tool: str, event: str):
+        stats = self._stats.setdefault(tool, {"hits": 0, "misses": 0, "collapsed": 0})
+        stats[event] += 1
+
+    def get(self, provider: str, endpoint: str, payload: Any, tool: Optional[str] = None) -> Optional[Any]:
+        """Fresh cached response, or None. Counts a hit or miss for ``tool``."""
+        key = cache_key(provider, endpoint, payload)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response FROM response_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+            self._count(tool or provider, "hits" if row is not None else "misses")
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, provider: str, endpoint: str, payload: Any, response: Any, ttl: Optional[int] = None):
+        key = cache_key(provider, endpoint, payload)
+        body = json.dumps(response, ensure_ascii=False, default=str)
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttls.get(provider, DEFAULT_TTL)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, provider, response, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, body, len(body.encode("utf-8")), now + ttl, now)
+            )
+            conn.commit()
+            self._evict()
+
+    def _evict(self):
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+        # Trim least recently used entries down to 90% of the budget, to avoid evicting on every put
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM response_cache ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        conn.commit()
+        logger.info(f"Response cache: evicted {evicted} entries, {total / 1024 / 1024:.1f} MiB kept")
+
+    def _claim(self, provider: str, key: str, tool: Optional[str]) -> Tuple[Future, bool]:
+        """In-flight future for ``key`` and whether this caller owns (must perform) the fetch."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count(tool or provider, "collapsed")
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _settle(self, provider: str, endpoint: str, payload: Any, key: str, future: Future,
+                response: Any = None, error: Optional[BaseException] = None, ttl: Optional[int] = None):
+        """Store a successful response, then resolve the in-flight future for every waiter."""
+        try:
+            if error is None:
+                self.put(provider, endpoint, payload, response, ttl)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache {provider} response: {str(e)}")
+        finally:
+            if error is None:
+                future.set_result(response)
+            else:
+                future.set_exception(error)
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_or_fetch(self, provider: str, endpoint: str, payload: Any, fetch: Callable[[], Any],
+                     tool: Optional[str] = None, ttl: Optional[int] = None) -> Any:
+        """
+        Cached response, or the result of ``fetch()`` (stored for ``ttl`` seconds).
+
+        If the same request is already in flight (in another thread or in
+        ``aget_or_fetch``), waits for it instead of calling ``fetch`` again.
+        Exceptions are not cached; they propagate to every waiting caller.
+        """
+        cached = self.get(provider, endpoint, payload, tool)
+        if cached is not None:
+            return cached
+
+        key = cache_key(provider, endpoint, payload)
+        future, owner = self._claim(provider, key, tool)
+        if not owner:
+            return future.result()
+        try:
+            response = fetch()
+        except BaseException as e:
+            self._settle(provider, endpoint, payload, key, future, error=e)
+            raise
+        self._settle(provider, endpoint, payload, key, future, response, ttl=ttl)
+        return response
+
+    async def aget_or_fetch(self, provider: str, endpoint: str, payload: Any, fetch: Callable[[], Awaitable[Any]],
+                            tool: Optional[str] = None, ttl: Optional[int] = None) -> Any:
+        """Async counterpart of ``get_or_fetch``, sharing its in-flight requests; ``fetch`` returns an awaitable."""
+        cached = self.get(provider, endpoint, payload, tool)
+        if cached is not None:
+            return cached
+
+        key = cache_key(provider, endpoint, payload)
+        future, owner = self._claim(provider, key, tool)
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            response = await fetch()
+        except BaseException as e:
+            self._settle(provider, endpoint, payload, key, future, error=e)
+            raise
+        self._settle(provider, endpoint, payload, key, future, response, ttl=ttl)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits, misses, collapsed duplicates and hit ratio per tool."""
+        with self._lock:
+            report = {}
+            for tool, stats in self._stats.items():
+                lookups = stats["hits"] + stats["misses"]
+                report[tool] = {
+                    **stats,
+                    "hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+                    # Collapsed duplicates never reached the provider either
+                    "calls_saved": stats["hits"] + stats["collapsed"],
+                }
+            return report
+
+    def clear(self, provider: Optional[str] = None):
+        with self._lock:
+            conn = self._connection()
+            if provider is None:
+                conn.execute("DELETE FROM response_cache")
+            else:
+                conn.execute("DELETE FROM response_cache WHERE provider = ?", (provider,))
+            conn.commit()
+
+
+# Shared by every outbound tool in the process
+response_cache = ResponseCache()
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import random
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Any
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_OUTPUT_DIR = os.getenv("SENTIMENT_BENCHMARK_DIR", os.path.join("report", "benchmarks"))
+BATCH_SIZES = (1, 8, 32, 64)
+# texts/sec drop (relative to a baseline run) that counts as a regression
+REGRESSION_TOLERANCE = 0.10
+
+# Offline labeled mentions: (text, expected sentiment, language)
+CORPUS = [
+    ("I love the new update, everything feels faster!", "positive", "en"),
+    ("Customer support fixed my issue in five minutes. Impressed.", "positive", "en"),
+    ("Best purchase I've made this year, the battery lasts forever.", "positive", "en"),
+    ("Great design and the price was fair.", "positive", "en"),
+    ("Thanks for the quick delivery, the package arrived in perfect condition.", "positive", "en"),
+    ("The app keeps crashing and support never answers. Terrible.", "negative", "en"),
+    ("Worst experience ever, I want a refund.", "negative", "en"),
+    ("The charger broke after two days, totally useless.", "negative", "en"),
+    ("Their latest outage cost us a full day of work. Unacceptable.", "negative", "en"),
+    ("This is a scam, they charged me twice and ignore my emails.", "negative", "en"),
+    ("Just saw their new ad on TV.", "neutral", "en"),
+    ("The store opens at 9am on weekdays.", "neutral", "en"),
+    ("They announced the earnings call for next Thursday.", "neutral", "en"),
+    ("Sản phẩm rất tốt, giao hàng nhanh, tôi rất hài lòng!", "positive", "vi"),
+    ("Dịch vụ khách hàng quá tệ, tôi sẽ không mua nữa.", "negative", "vi"),
+    ("Cửa hàng mở cửa lúc 9 giờ sáng.", "neutral", "vi"),
+    ("J'adore ce produit, il est vraiment excellent.", "positive", "fr"),
+    ("Le service client est horrible, je suis très déçu.", "negative", "fr"),
+    ("Ich bin sehr zufrieden, die Lieferung war schnell.", "positive", "de"),
+    ("Das Produkt ist kaputt und der Support antwortet nicht.", "negative", "de"),
+    ("El producto es excelente y llegó a tiempo.", "positive", "es"),
+    ("La aplicación no funciona y nadie responde.", "negative", "es"),
+]
+
+# Neutral filler used to stretch mentions into long posts (past the 512-token limit)
+_FILLER = (
+    "I have been using it every day for work and travel, comparing it with other brands "
+    "and reading what other people in the forums have to say about it."
+)
+
+
+def build_corpus(size: int = 512, seed: int = 13) -> List[Dict[str, Any]]:
+    """
+    Deterministic corpus of ``size`` labeled mentions drawn from ``CORPUS``.
+
+    Roughly 60% are kept short, 30% are padded to a few sentences and 10% to
+    long-form posts, so the benchmark exercises length bucketing and chunking.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        text, label, language = CORPUS[i % len(CORPUS)]
+        roll = rng.random()
+        if roll < 0.6:
+            length = "short"
+        elif roll < 0.9:
+            length, text = "medium", f"{text} {' '.join([_FILLER] * rng.randint(1, 3))}"
+        else:
+            length, text = "long", f"{text} {' '.join([_FILLER] * rng.randint(15, 30))}"
+        # Unique suffix so the sentiment cache cannot short-circuit repeated texts
+        corpus.append({"text": f"{text} #{i}", "label": label, "language": language, "length": length})
+    return corpus
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+def _category(sentiment: Dict[str, Any], confidence: float = 0.7) -> str:
+    """Same thresholding as the tool's distribution."""
+    if sentiment["label"] == "POSITIVE" and sentiment["score"] > confidence:
+        return "positive"
+    if sentiment["label"] == "NEGATIVE" and sentiment["score"] > confidence:
+        return "negative"
+    return "neutral"
+
+
+def _benchmark_batch_size(tool, corpus: List[Dict[str, Any]], batch_size: int) -> Dict[str, Any]:
+    texts = [item["text"] for item in corpus]
+    latencies = []
+    records = []
+    start = time.perf_counter()
+    for offset in range(0, len(texts), batch_size):
+        request_start = time.perf_counter()
+        records.extend(tool._infer_batch(texts[offset:offset + batch_size]))
+        latencies.append(time.perf_counter() - request_start)
+    wall = time.perf_counter() - start
+
+    predicted = [_category(r["sentiment"]) for r in records]
+    correct = np.array([p == item["label"] for p, item in zip(predicted, corpus)])
+    languages = np.array([item["language"] for item in corpus])
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "batch_size": batch_size,
+        "texts": len(texts),
+        "wall_seconds": round(wall, 4),
+        "texts_per_second": round(len(texts) / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 3),
+            "per_text": round(float(latencies_ms.sum() / len(texts)), 3),
+        },
+        "stage_seconds": {stage: round(seconds, 4) for stage, seconds in tool.stage_seconds.items()},
+        "peak_rss_mb": peak_rss_mb(),
+        "accuracy": round(float(correct.mean()), 4),
+        "accuracy_by_language": {
+            language: round(float(correct[languages == language].mean()), 4)
+            for language in dict.fromkeys(languages.tolist())
+        },
+    }
+
+
+def run_benchmark(batch_sizes: Sequence[int] = BATCH_SIZES, size: int = 512,
+                  output_path: Optional[str] = None, seed: int = 13, **tool_kwargs) -> Dict[str, Any]:
+    """
+    Benchmark batched inference over the bundled corpus at each batch size.
+
+    Every batch size gets a fresh tool (sharing the model registry, so models load
+    once) with the cache disabled, and one warm-up request so that model loading
+    is not timed. The report is written as JSON to ``output_path`` (default: a
+    timestamped file in ``BENCHMARK_OUTPUT_DIR``); pass ``output_path=""`` to skip
+    writing.
+    """
+    from tools.sentiment_tool import SentimentAnalysisTool
+    from tools.sentiment_history import SentimentHistoryStore
+
+    corpus = build_corpus(size, seed)
+    runs = []
+    for batch_size in batch_sizes:
+        tool = SentimentAnalysisTool(
+            batch_size=batch_size, use_cache=False, history_store=SentimentHistoryStore(None), **tool_kwargs
+        )
+        tool._infer_batch([item["text"] for item in corpus[:batch_size]])
+        tool.stage_seconds = dict.fromkeys(tool.stage_seconds, 0.0)
+        runs.append(_benchmark_batch_size(tool, corpus, batch_size))
+        logger.info(f"Sentiment benchmark, batch size {batch_size}: {runs[-1]['texts_per_second']} texts/sec")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "corpus": {
+            "texts": len(corpus),
+            "seed": seed,
+            "languages": dict(Counter(c["language"] for c in corpus)),
+            "lengths": dict(Counter(c["length"] for c in corpus)),
+        },
+        "settings": {k: v for k, v in tool_kwargs.items() if k != "model_registry"},
+        "runs": runs,
+    }
+
+    if output_path is None:
+        output_path = os.path.join(BENCHMARK_OUTPUT_DIR, f"sentiment_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    if output_path:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        report["output_path"] = output_path
+    return report
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = REGRESSION_TOLERANCE) -> List[Dict[str, Any]]:
+    """Per batch size throughput/latency change versus ``baseline``; flags regressions beyond ``tolerance``."""
+    previous = {run["batch_size"]: run for run in baseline["runs"]}
+    changes = []
+    for run in current["runs"]:
+        base = previous.get(run["batch_size"])
+        if base is None or not base["texts_per_second"]:
+            continue
+        throughput = run["texts_per_second"] / base["texts_per_second"] - 1
+        changes.append({
+            "batch_size": run["batch_size"],
+            "throughput_change": round(throughput, 4),
+            "p95_change": round(run["latency_ms"]["p95"] / base["latency_ms"]["p95"] - 1, 4),
+            "accuracy_change": round(run["accuracy"] - base["accuracy"], 4),
+            "regression": throughput < -tolerance,
+        })
+    return changes
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = run_benchmark()
+    for run in result["runs"]:
+        print(f"batch {run['batch_size']:>3}: {run['texts_per_second']} texts/sec, "
+              f"p50 {run['latency_ms']['p50']} ms, p95 {run['latency_ms']['p95']} ms, "
+              f"peak RSS {run['peak_rss_mb']} MiB, stages {run['stage_seconds']}")
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            for change in compare_reports(json.load(f), result):
+                print(change)
+    print(f"Report written to {result['output_path']}")
@@ -0,0 +1,151 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_CACHE_DB = os.getenv("SENTIMENT_CACHE_DB", os.path.join("db", "sentiment_cache.db"))
+
+# Bump when the shape of cached records changes
+CACHE_SCHEMA = 2
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for hashing: NFC, collapsed whitespace, trimmed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class SentimentCache:
+    """
+    Content-addressed cache of per-text sentiment, emotion and aspect results.
+
+    Entries are keyed by the hash of the normalized text plus a model version
+    string, so changing a model or stage configuration never serves stale
+    results. Lookups go to an in-memory LRU first and then to a SQLite file that
+    survives restarts; only texts missing from both are sent to inference.
+    """
+
+    def __init__(self, db_path: Optional[str] = SENTIMENT_CACHE_DB, max_memory_entries: int = 50000):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._conn = None
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(text: str, model_version: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_version}:{digest}"
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, record: Dict[str, Any]):
+        self._memory[key] = record
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up keys in memory, then on disk; returns only the keys that were found."""
+        found = {}
+        with self._lock:
+            pending = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self._stats["memory_hits"] += 1
+                else:
+                    pending.append(key)
+
+            conn = self._connection()
+            if conn is not None:
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT key, result FROM sentiment_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, result in rows:
+                        record = json.loads(result)
+                        found[key] = record
+                        self._remember(key, record)
+                        self._stats["disk_hits"] += 1
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            for key, record in records.items():
+                self._remember(key, record)
+            conn = self._connection()
+            if conn is not None and records:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, result, created_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(record), now) for key, record in records.items()]
+                )
+                conn.commit()
+
+    def get_or_compute(self, texts: List[str], model_version: str,
+                       compute: Callable[[List[str]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return one record per text, running ``compute`` only on distinct uncached texts."""
+        version = f"v{CACHE_SCHEMA}-{model_version}"
+        keys = [self.key(t, version) for t in texts]
+        found = self.get_many(list(dict.fromkeys(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            computed = dict(zip(missing, compute(list(missing.values()))))
+            self.put_many(computed)
+            found.update(computed)
+        logger.info(f"Sentiment cache: {len(texts) - len(missing)} cached, {len(missing)} inferred")
+        return [found[key] for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM sentiment_cache")
+                conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters for both tiers."""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "hit_ratio": hits / lookups if lookups else 0.0
+            }
+
+
+# Shared by every SentimentAnalysisTool in the process
+sentiment_cache = SentimentCache()
@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_HISTORY_DB = os.getenv("SENTIMENT_HISTORY_DB", os.path.join("db", "sentiment_history.db"))
+
+
+class SentimentRingBuffer:
+    """
+    Fixed-capacity ring of ``(timestamp, negative_percent)`` samples in NumPy arrays.
+
+    Appends are O(1) and overwrite the oldest sample once full. Samples are
+    appended in time order, so windowed queries binary-search the two physical
+    segments of the ring in place instead of copying the history.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.head = 0  # next write position
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, value: float):
+        self.timestamps[self.head] = timestamp
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _segments(self):
+        """Physical (start, stop) ranges of the ring in chronological order."""
+        start = (self.head - self.size) % self.capacity
+        if start + self.size <= self.capacity:
+            return [(start, start + self.size)]
+        return [(start, self.capacity), (0, self.head)]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.size:
+            return None
+        i = (self.head - 1) % self.capacity
+        return float(self.timestamps[i]), float(self.values[i])
+
+    def oldest_since(self, since: float) -> Optional[Tuple[float, float]]:
+        """First sample with ``timestamp >= since``, or None if the window is empty."""
+        for start, stop in self._segments():
+            segment = self.timestamps[start:stop]  # view, no copy
+            offset = int(np.searchsorted(segment, since, side="left"))
+            if offset < len(segment):
+                i = start + offset
+                return float(self.timestamps[i]), float(self.values[i])
+        return None
+
+    def count_since(self, since: float) -> int:
+        """Number of samples with ``timestamp >= since``."""
+        return sum(
+            stop - start - int(np.searchsorted(self.timestamps[start:stop], since, side="left"))
+            for start, stop in self._segments()
+        )
+
+
+class SentimentHistoryStore:
+    """
+    Per-brand sentiment history: one ring buffer per brand, persisted to SQLite.
+
+    A brand's buffer is filled from disk the first time it is used, so temporal
+    analysis continues across restarts.
+    """
+
+    def __init__(self, db_path: Optional[str] = SENTIMENT_HISTORY_DB, capacity: int = 1024):
+        self.db_path = db_path
+        self.capacity = capacity
+        self._buffers: Dict[str, SentimentRingBuffer] = {}
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_history ("
+                "brand TEXT NOT NULL, ts REAL NOT NULL, negative_percent REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sentiment_history_brand_ts ON sentiment_history (brand, ts)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def buffer(self, brand: str) -> SentimentRingBuffer:
+        """Ring buffer for ``brand``, loaded from disk on first access."""
+        with self._lock:
+            if brand not in self._buffers:
+                ring = SentimentRingBuffer(self.capacity)
+                conn = self._connection()
+                if conn is not None:
+                    rows = conn.execute(
+                        "SELECT ts, negative_percent FROM sentiment_history WHERE brand = ? "
+                        "ORDER BY ts DESC LIMIT ?",
+                        (brand, self.capacity)
+                    ).fetchall()
+                    for ts, value in reversed(rows):
+                        ring.append(ts, value)
+                self._buffers[brand] = ring
+            return self._buffers[brand]
+
+    def append(self, brand: str, negative_percent: float, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            ring = self.buffer(brand)
+            latest = ring.latest()
+            if latest and timestamp < latest[0]:
+                timestamp = latest[0]  # keep the ring sorted if the clock steps back
+            ring.append(timestamp, negative_percent)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT INTO sentiment_history (brand, ts, negative_percent) VALUES (?, ?, ?)",
+                    (brand, timestamp, negative_percent)
+                )
+                conn.commit()
+
+
+# Shared by every SentimentAnalysisTool in the process
+sentiment_history_store = SentimentHistoryStore()
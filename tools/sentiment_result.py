@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+from tools.emotion_profile import EmotionProfile
+
+
+@dataclass(slots=True)
+class SentimentResult:
+    """Typed outcome of one sentiment analysis run; ``render`` gives the text the agent sees."""
+    brand: str
+    total_texts: int
+    distribution: Dict[str, float]
+    emotions: Dict[str, float]
+    aspects: Dict[str, Dict[str, Any]]
+    temporal: Dict[str, Any]
+    crisis_signals: List[str]
+    emotion_profile: Optional[EmotionProfile] = None
+    trending_keywords: List[Dict[str, Any]] = field(default_factory=list)
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def negative_percent(self) -> float:
+        return self.distribution["negative"]
+
+    @property
+    def crisis_detected(self) -> bool:
+        return len(self.crisis_signals) > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__ if name != "emotion_profile"}
+        data["emotion_profile"] = self.emotion_profile.to_dict() if self.emotion_profile else None
+        data["crisis_detected"] = self.crisis_detected
+        return data
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def render(self) -> str:
+        """Markdown-like report handed back to the agent."""
+        distribution, temporal = self.distribution, self.temporal
+        output = [
+            "Advanced Sentiment Analysis Report:",
+            f"- Sentiment Distribution:",
+            f"  - Positive: {distribution['positive']:.2f}%",
+            f"  - Neutral: {distribution['neutral']:.2f}%",
+            f"  - Negative: {distribution['negative']:.2f}%",
+            f"- Temporal Analysis:",
+            f"  - Pattern: {temporal['pattern']}",
+            f"  - Trend: {temporal['trend']}",
+            f"  - Velocity: {temporal['velocity']:.2f}",
+        ]
+        profile = self.emotion_profile
+        if profile is not None and profile.partial:
+            output.append(f"- Top Emotions (scored for {profile.texts} of {profile.total_texts} mentions):")
+        else:
+            output.append(f"- Top Emotions:")
+
+        # Add top emotions
+        for emotion, score in sorted(self.emotions.items(), key=lambda x: x[1], reverse=True)[:3]:
+            output.append(f"  - {emotion}: {score:.2f}")
+
+        # Add key aspects
+        output.append(f"- Key Aspects:")
+        for aspect, data in sorted(self.aspects.items(), key=lambda x: x[1]["confidence"], reverse=True)[:3]:
+            output.append(f"  - {aspect}: {data['sentiment']} ({data['confidence']:.2f})")
+
+        # Add emerging topics
+        if self.trending_keywords:
+            output.append(f"- Emerging Topics:")
+            for topic in self.trending_keywords[:5]:
+                output.append(f"  - {topic['keyword']}: {topic['ratio']:.1f}x baseline")
+
+        # Add crisis status
+        if self.crisis_detected:
+            output.append(f"- Crisis Status: DETECTED")
+            output.append(f"- Crisis Signals:")
+            for signal in self.crisis_signals:
+                output.append(f"  - {signal}")
+        else:
+            output.append(f"- Crisis Status: No crisis detected")
+
+        return "\n".join(output)
+
+
+# Side channel: the latest result per brand, readable without parsing crew transcripts
+_latest: Dict[str, SentimentResult] = {}
+_latest_lock = threading.Lock()
+
+
+def publish_result(result: SentimentResult):
+    with _latest_lock:
+        _latest[result.brand] = result
+
+
+def latest_result(brand: Optional[str] = None, since: Optional[float] = None) -> Optional[SentimentResult]:
+    """
+    Most recent result published for ``brand`` (crews bind their sentiment tool to
+    their brand), or None if it is older than ``since``. Results of other brands
+    are never returned, since concurrent sessions may be monitoring them.
+    """
+    with _latest_lock:
+        result = _latest.get(brand)
+    return result if result is not None and (since is None or result.timestamp >= since) else None
@@ -0,0 +1,67 @@
+from typing import Dict, Any
+import numpy as np
+from tools.emotion_profile import EmotionHistogram
+
+CATEGORIES = ("positive", "neutral", "negative")
+
+
+class SentimentAccumulator:
+    """
+    Running sentiment aggregates updated in O(1) per analyzed mention.
+
+    Holds only counters - category counts, emotion score sums and histograms, the
+    latest result per aspect and per-aspect sentiment tallies - so memory stays flat no matter
+    how many mentions stream through.
+    """
+
+    def __init__(self, confidence: float = 0.7):
+        self.confidence = confidence
+        self.counts = np.zeros(len(CATEGORIES))
+        self.emotions: Dict[str, float] = {}
+        self.aspects: Dict[str, Dict[str, Any]] = {}
+        self.aspect_tallies: Dict[str, Dict[str, int]] = {}
+        self.emotion_histogram = EmotionHistogram()
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, record: Dict[str, Any]):
+        """Fold one per-text record (``sentiment``, ``emotions``, ``aspects``) into the totals."""
+        sentiment = record["sentiment"]
+        if sentiment["label"] == "POSITIVE" and sentiment["score"] > self.confidence:
+            self.counts[0] += 1
+        elif sentiment["label"] == "NEGATIVE" and sentiment["score"] > self.confidence:
+            self.counts[2] += 1
+        else:
+            self.counts[1] += 1
+
+        for emotion, score in record["emotions"].items():
+            self.emotions[emotion] = self.emotions.get(emotion, 0) + score
+        self.emotion_histogram.add(record["emotions"])
+
+        for aspect, data in record["aspects"].items():
+            self.aspects[aspect] = data
+            tally = self.aspect_tallies.setdefault(aspect, {})
+            tally[data["sentiment"]] = tally.get(data["sentiment"], 0) + 1
+
+    def partial(self) -> Dict[str, Any]:
+        """Totals in the same shape as ``SentimentAnalysisTool._partial_aggregate``."""
+        return {"counts": self.counts.copy(), "emotions": dict(self.emotions), "aspects": dict(self.aspects),
+                "emotion_profile": self.emotion_histogram.to_profile(self.count)}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current distribution (percent), normalized emotions, aspects and tallies."""
+        total = self.count
+        distribution = dict(zip(CATEGORIES, (self.counts / total * 100).tolist())) if total else \
+            dict.fromkeys(CATEGORIES, 0.0)
+        emotion_total = sum(self.emotions.values())
+        emotions = {k: v / max(total, emotion_total) for k, v in self.emotions.items()} if emotion_total > 0 else {}
+        return {
+            "processed": total,
+            "distribution": distribution,
+            "emotions": emotions,
+            "aspects": dict(self.aspects),
+            "aspect_tallies": {k: dict(v) for k, v in self.aspect_tallies.items()},
+            "emotion_profile": self.emotion_histogram.to_profile(self.count),
+        }
@@ -1,15 +1,31 @@
 import os
 import logging
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from crewai.tools import BaseTool
 from pydantic import Field, BaseModel
 from pydantic.config import ConfigDict
-from typing import Union, List, Dict, Optional, Any
+from typing import Union, List, Dict, Optional, Any, Iterable, Iterator, Sequence
 from collections import Counter
 import numpy as np
-from functools import lru_cache
 import asyncio
+import multiprocessing as mp
 import time
+import hashlib
+from tools.aspect_engine import AspectEngine
+from tools.model_registry import MODEL_SPECS, ModelRegistry, registry
+from tools.onnx_backend import OnnxTextClassifier, agreement_report
+from tools.sentiment_cache import SentimentCache, sentiment_cache
+from tools.language_id import detect_language, group_by_language
+from tools.length_batching import ChunkedClassifier
+from tools.sharded_sentiment import analyze_sharded
+from tools.sentiment_history import SentimentHistoryStore, sentiment_history_store
+from tools.sentiment_stream import SentimentAccumulator
+from tools.lexicon_sentiment import LexiconScorer
+from tools.sentiment_result import SentimentResult, publish_result
+from tools.emotion_profile import EmotionProfile, emotion_matrix, stack_matrices
+from tools.inference_batcher import InferenceBatcher
+from tools.sentiment_benchmark import BATCH_SIZES, run_benchmark
+from tools.trending_keywords import TrendingKeywordDetector, trending_keywords
+from tools.mention_store import MentionStore, mention_store
 
 # Configure logging
 logging.basicConfig(
@@ -34,110 +50,415 @@ class SentimentAnalysisTool(BaseTool):
     )
     model_config = ConfigDict(extra='allow')
 
-    def __init__(self, crisis_threshold: float = 50.0, custom_keywords: Optional[List[str]] = None):
+    def __init__(self, crisis_threshold: float = 50.0, custom_keywords: Optional[List[str]] = None,
+                 batch_size: int = 32, batched: bool = True, analyze_emotions: bool = True,
+                 analyze_aspects: bool = True, model_registry: Optional[ModelRegistry] = None,
+                 backend: str = "torch", onnx_threads: Optional[int] = None,
+                 use_cache: bool = True, cache: Optional[SentimentCache] = None,
+                 language_routing: bool = True, workers: int = 1, shard_size: int = 512, shard_timeout: float = 600.0,
+                 history_store: Optional[SentimentHistoryStore] = None, cascade: bool = False,
+                 lexicon_threshold: float = 0.85, positive_threshold: float = 0.9,
+                 coalesce_batch_size: int = 64, coalesce_wait_ms: float = 10.0, coalesce_queue_depth: int = 1024,
+                 trend_detector: Optional[TrendingKeywordDetector] = None, default_brand: str = "default"):
         super().__init__()
         self.crisis_threshold = crisis_threshold
+        self.batch_size = batch_size  # texts per forward pass in batched mode
+        self.batched = batched
+        # Disabled stages are never run, so their models are never loaded
+        self.analyze_emotions = analyze_emotions
+        self.analyze_aspects = analyze_aspects
         self.custom_keywords = custom_keywords or [
             "crisis", "urgent", "emergency", "problem", "issue",
             "complaint", "negative", "bad", "terrible", "worst",
             "excellent", "great", "good", "positive", "amazing"
         ]
-        self.primary_pipeline = None
-        self.fallback_pipeline = None
-        self.emotion_pipeline = None
-        self.aspect_pipeline = None
+        # Cascade: lexicon -> DistilBERT -> emotion/aspect models only for negative or ambiguous texts
+        self.cascade = cascade
+        self.lexicon_threshold = lexicon_threshold  # lexicon confidence that resolves a text at tier 1
+        self.positive_threshold = positive_threshold  # positive confidence that skips emotion/aspect models
+        self.lexicon = LexiconScorer(self.custom_keywords)
+        self.cascade_stats = {"texts": 0, "lexicon": 0, "transformer": 0, "enriched": 0}
+        # Pipelines are loaded lazily and shared process-wide through the registry
+        self.model_registry = model_registry or registry
+        if backend not in ("torch", "onnx"):
+            raise ValueError("Invalid backend. Use 'torch' or 'onnx'.")
+        self.backend = backend  # "onnx" serves primary sentiment and emotions from quantized ONNX models
+        self.onnx_threads = onnx_threads  # intra-op threads per ONNX Runtime session
+        # Non-English texts go to the multilingual model instead of English DistilBERT
+        self.language_routing = language_routing
+        # Inputs longer than shard_size are split across a pool of `workers` processes
+        self.workers = workers
+        self.shard_size = shard_size
+        self.shard_timeout = shard_timeout  # seconds before a stuck worker pool is abandoned
+        self.last_shard_stats = {}
+        # Per-text results are reused across refreshes in batched mode
+        self.cache = (cache or sentiment_cache) if use_cache else None
+        self._aspect_engine = None
+        self._chunked_classifiers = {}
         self.temporal_window = 24  # hours for temporal analysis
-        self.sentiment_history = []  # Store historical sentiment data
-        self._initialize_pipelines()
-
-    def _initialize_pipelines(self):
-        """Initialize all sentiment analysis pipelines."""
-        try:
-            # Primary sentiment pipeline (DistilBERT)
-            self.primary_pipeline = pipeline(
-                "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
-                device=-1  # Force CPU
+        self.velocity_threshold = 0.1  # negative-percent points per hour
+        self.emotion_crisis_share = 0.25  # share of strongly negative-emotion mentions that signals a crisis
+        # Brand that history, trends and published results are filed under when a call names none
+        self.default_brand = default_brand
+        # Timestamped negative-percent history per brand, persisted across restarts
+        self.history_store = history_store or sentiment_history_store
+        self.last_result: Optional[SentimentResult] = None
+        # Hashtag frequencies per brand and time bucket; spikes surface as emerging topics
+        self.trend_detector = trend_detector or trending_keywords
+        # Concurrent _arun calls are coalesced into shared batches on one inference thread
+        self.coalesce_batch_size = coalesce_batch_size
+        self.coalesce_wait_ms = coalesce_wait_ms
+        self.coalesce_queue_depth = coalesce_queue_depth
+        self._batcher = None
+        # Cumulative seconds spent in each batched inference stage
+        self.stage_seconds = {"primary": 0.0, "emotion": 0.0, "aspect": 0.0}
+
+    def _onnx_key(self, name: str) -> str:
+        """Registry key of the ONNX variant of ``name``, registering its loader on first use."""
+        key = f"{name}:onnx:{self.onnx_threads or 'auto'}"
+        self.model_registry.register(
+            key, lambda: OnnxTextClassifier(MODEL_SPECS[name]["model"], intra_op_threads=self.onnx_threads)
+        )
+        return key
+
+    def _model_key(self, name: str) -> str:
+        return self._onnx_key(name) if self.backend == "onnx" else name
+
+    @property
+    def primary_pipeline(self):
+        """Primary sentiment pipeline (DistilBERT)."""
+        return self.model_registry.get(self._model_key("primary"))
+
+    @property
+    def fallback_pipeline(self):
+        """Fallback multilingual pipeline."""
+        return self.model_registry.get("fallback")
+
+    @property
+    def emotion_pipeline(self):
+        """Emotion detection pipeline."""
+        return self.model_registry.get(self._model_key("emotion"))
+
+    @property
+    def aspect_pipeline(self):
+        """Zero-shot NLI pipeline for aspect-based sentiment analysis."""
+        return self.model_registry.get("aspect")
+
+    @property
+    def aspect_engine(self) -> AspectEngine:
+        """Batched aspect engine, rebuilt if the registry reloaded the NLI model."""
+        nli = self.aspect_pipeline
+        if self._aspect_engine is None or self._aspect_engine.model is not nli.model:
+            self._aspect_engine = AspectEngine(nli)
+        return self._aspect_engine
+
+    @property
+    def model_version(self) -> str:
+        """Fingerprint of everything that affects per-text results, used in cache keys."""
+        parts = [MODEL_SPECS["primary"]["model"], MODEL_SPECS["fallback"]["model"], self.backend,
+                 f"routing={self.language_routing}"]
+        if self.analyze_emotions:
+            parts.append(MODEL_SPECS["emotion"]["model"])
+        if self.analyze_aspects:
+            parts.append(MODEL_SPECS["aspect"]["model"])
+        if self.cascade:
+            parts.append(f"cascade={self.lexicon_threshold},{self.positive_threshold},{sorted(self.lexicon.negative)}")
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit and miss counters of the result cache."""
+        return self.cache.stats() if self.cache else {}
+
+    def _chunked(self, name: str) -> ChunkedClassifier:
+        """Length-bucketed, chunking classifier over the registry model ``name``."""
+        model = self.model_registry.get(self._model_key(name))
+        classifier = self._chunked_classifiers.get(name)
+        if classifier is None or classifier.source is not model:
+            classifier = ChunkedClassifier.from_model(model, batch_size=self.batch_size)
+            self._chunked_classifiers[name] = classifier
+        return classifier
+
+    def model_stats(self) -> Dict[str, Any]:
+        """Load and eviction statistics of the shared model registry."""
+        return self.model_registry.stats()
+
+    def check_onnx_agreement(self, texts: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Report how often the quantized ONNX models disagree with the PyTorch pipelines."""
+        report = {}
+        for name in ("primary", "emotion"):
+            report[name] = agreement_report(
+                self.model_registry.get(name),
+                self.model_registry.get(self._onnx_key(name)),
+                texts,
+                batch_size=self.batch_size
             )
-
-            # Fallback multilingual pipeline
-            self.fallback_pipeline = pipeline(
-                "sentiment-analysis",
-                model="nlptown/bert-base-multilingual-uncased-sentiment",
-                device=-1
-            )
-
-            # Emotion detection pipeline
-            self.emotion_pipeline = pipeline(
-                "text-classification",
-                model="j-hartmann/emotion-english-distilroberta-base",
-                device=-1
-            )
-
-            # Aspect-based sentiment analysis
-            self.aspect_pipeline = pipeline(
-                "zero-shot-classification",
-                model="facebook/bart-large-mnli",
-                device=-1
-            )
-
-            logger.info("Successfully initialized all sentiment analysis pipelines")
-        except Exception as e:
-            logger.error(f"Failed to initialize pipelines: {str(e)}")
-            raise
+            logger.info(f"ONNX agreement for {name}: {report[name]['disagreement_rate']:.2%} labels differ")
+        return report
 
     def _extract_aspects(self, text: str) -> Dict[str, Dict]:
         """Extract aspects and their sentiment from text."""
-        aspects = {
-            "product": ["quality", "features", "design", "performance"],
-            "service": ["support", "delivery", "response", "help"],
-            "brand": ["reputation", "image", "trust", "value"],
-            "price": ["cost", "value", "affordability", "pricing"]
-        }
-        
-        results = {}
-        for category, terms in aspects.items():
-            for term in terms:
-                result = self.aspect_pipeline(
-                    text,
-                    candidate_labels=[f"positive {term}", f"negative {term}", f"neutral {term}"],
-                    multi_label=True
-                )
-                if result["scores"][0] > 0.5:  # Confidence threshold
-                    sentiment = result["labels"][0].split()[0]
-                    results[f"{category}_{term}"] = {
-                        "sentiment": sentiment,
-                        "confidence": result["scores"][0]
-                    }
-        return results
+        return self.aspect_engine.extract([text])[0]
 
     def _detect_emotions(self, text: str) -> Dict[str, float]:
-        """Detect emotions in text."""
+        """Detect emotions in text: probability of every emotion class (long texts are chunked)."""
         try:
-            result = self.emotion_pipeline(text)
-            return {result[0]["label"]: result[0]["score"]}
+            classifier = self._chunked("emotion")
+            probs = classifier.predict_proba([text])[0]
+            return {classifier.id2label[i]: score for i, score in enumerate(probs.tolist())}
         except Exception as e:
             logger.warning(f"Emotion detection failed: {str(e)}")
             return {}
 
-    def _detect_temporal_patterns(self, current_sentiment: float) -> Dict[str, Any]:
-        """Detect temporal patterns in sentiment data."""
-        if not self.sentiment_history:
+    @staticmethod
+    def _map_star_rating(star_scores: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Collapse nlptown 1-5 star scores onto the POSITIVE/NEUTRAL/NEGATIVE scheme."""
+        buckets = {"NEGATIVE": 0.0, "NEUTRAL": 0.0, "POSITIVE": 0.0}
+        for item in star_scores:
+            stars = int(item["label"].split()[0])
+            label = "NEGATIVE" if stars <= 2 else "NEUTRAL" if stars == 3 else "POSITIVE"
+            buckets[label] += item["score"]
+        label = max(buckets, key=buckets.get)
+        return {"label": label, "score": buckets[label]}
+
+    def _classify_multilingual(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Multilingual sentiment with star ratings mapped to the primary label scheme."""
+        outputs = self._chunked("fallback")(texts, top_k=None)
+        return [self._map_star_rating(scores) for scores in outputs]
+
+    def _classify_primary(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Primary sentiment in length buckets; long documents are chunked and re-aggregated."""
+        try:
+            return self._chunked("primary")(texts)
+        except Exception as e:
+            # Fall back per text so a single bad input behaves like the sequential path
+            logger.warning(f"Batched primary sentiment failed, retrying per text: {str(e)}")
+            results = []
+            for t in texts:
+                try:
+                    results.append(self._chunked("primary")([t])[0])
+                except Exception:
+                    results.append(self._classify_multilingual([t])[0])
+            return results
+
+    def _classify_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Sentiment for a list of texts, each language group sent as one batch to its model."""
+        if not self.language_routing:
+            return self._classify_primary(texts)
+        results = [None] * len(texts)
+        for language, indices in group_by_language(texts).items():
+            group = [texts[i] for i in indices]
+            classify = self._classify_primary if language == "en" else self._classify_multilingual
+            for i, result in zip(indices, classify(group)):
+                results[i] = result
+        return results
+
+    def _detect_emotions_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Batched counterpart of ``_detect_emotions``: one call yields the full probability matrix."""
+        try:
+            classifier = self._chunked("emotion")
+            probs = classifier.predict_proba(texts)
+            labels = [classifier.id2label[i] for i in range(probs.shape[1])]
+            return [dict(zip(labels, row)) for row in probs.tolist()]
+        except Exception as e:
+            logger.warning(f"Batched emotion detection failed, retrying per text: {str(e)}")
+            return [self._detect_emotions(t) for t in texts]
+
+    def _extract_aspects_batch(self, texts: List[str]) -> List[Dict[str, Dict]]:
+        """Batched counterpart of ``_extract_aspects``: all texts share one NLI pass."""
+        return self.aspect_engine.extract(texts)
+
+    def _analyze_sequential(self, texts: List[str]) -> Dict[str, Any]:
+        """Per-text analysis path: one text at a time, chunked like the batched path so results match."""
+        records = []
+        for t in texts:
+            # Basic sentiment
+            if self.language_routing and detect_language(t) != "en":
+                result = self._classify_multilingual([t])[0]
+            else:
+                try:
+                    result = self._chunked("primary")([t])[0]
+                except Exception:
+                    result = self._classify_multilingual([t])[0]
+
+            # Extract aspects and emotions
+            records.append({
+                "sentiment": result,
+                "emotions": self._detect_emotions(t) if self.analyze_emotions else {},
+                "aspects": self._extract_aspects(t) if self.analyze_aspects else {}
+            })
+        return self._partial_aggregate(records)
+
+    def _timed(self, stage: str, stage_fn, texts: List[str]):
+        """Run one batched stage, adding its wall time to ``stage_seconds``."""
+        start = time.perf_counter()
+        try:
+            return stage_fn(texts)
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - start
+
+    def _infer_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Per-text sentiment, emotion and aspect results, one batched call per model."""
+        if self.cascade:
+            return self._infer_cascade(texts)
+        sentiment = self._timed("primary", self._classify_batch, texts)
+        aspects = self._timed("aspect", self._extract_aspects_batch, texts) if self.analyze_aspects \
+            else [{} for _ in texts]
+        emotions = self._timed("emotion", self._detect_emotions_batch, texts) if self.analyze_emotions \
+            else [{} for _ in texts]
+        return [
+            {"sentiment": s, "emotions": e, "aspects": a}
+            for s, e, a in zip(sentiment, emotions, aspects)
+        ]
+
+    def _infer_cascade(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Tiered inference: the lexicon resolves clear-cut English texts, DistilBERT
+        (or the multilingual model) handles the rest, and only texts that are not
+        confidently positive go on to the emotion and aspect models.
+        """
+        sentiment: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        tiers = ["transformer"] * len(texts)
+        for i, t in enumerate(texts):
+            if self.language_routing and detect_language(t) != "en":
+                continue
+            result = self.lexicon.classify(t)
+            if result and result["score"] >= self.lexicon_threshold:
+                sentiment[i] = result
+                tiers[i] = "lexicon"
+
+        undecided = [i for i, r in enumerate(sentiment) if r is None]
+        for i, result in zip(undecided, self._timed("primary", self._classify_batch, [texts[i] for i in undecided])):
+            sentiment[i] = result
+
+        enrich = [
+            i for i, r in enumerate(sentiment)
+            if not (r["label"] == "POSITIVE" and (tiers[i] == "lexicon" or r["score"] >= self.positive_threshold))
+        ]
+        enrich_texts = [texts[i] for i in enrich]
+        aspects = [{} for _ in texts]
+        emotions = [{} for _ in texts]
+        if enrich_texts and self.analyze_aspects:
+            for i, result in zip(enrich, self._timed("aspect", self._extract_aspects_batch, enrich_texts)):
+                aspects[i] = result
+        if enrich_texts and self.analyze_emotions:
+            for i, result in zip(enrich, self._timed("emotion", self._detect_emotions_batch, enrich_texts)):
+                emotions[i] = result
+
+        self.cascade_stats["texts"] += len(texts)
+        self.cascade_stats["lexicon"] += len(texts) - len(undecided)
+        self.cascade_stats["transformer"] += len(undecided)
+        self.cascade_stats["enriched"] += len(enrich)
+        return [
+            {"sentiment": s, "emotions": e, "aspects": a, "tier": tier}
+            for s, e, a, tier in zip(sentiment, emotions, aspects, tiers)
+        ]
+
+    def cascade_report(self) -> Dict[str, float]:
+        """Share of inferred texts resolved at each cascade tier."""
+        total = self.cascade_stats["texts"]
+        if not total:
+            return {"texts": 0}
+        return {
+            "texts": total,
+            "lexicon_share": self.cascade_stats["lexicon"] / total,
+            "transformer_share": self.cascade_stats["transformer"] / total,
+            "emotion_aspect_share": self.cascade_stats["enriched"] / total,
+        }
+
+    def _partial_aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Category counts, emotion sums and aspect map from per-text records, vectorized in NumPy."""
+        # Basic sentiment -> parallel label/score arrays
+        labels = np.array([r["sentiment"]["label"] for r in records], dtype=object)
+        scores = np.array([r["sentiment"]["score"] for r in records], dtype=float)
+        confident = scores > 0.7
+        positive = np.count_nonzero((labels == "POSITIVE") & confident)
+        negative = np.count_nonzero((labels == "NEGATIVE") & confident)
+        counts = np.array([positive, len(records) - positive - negative, negative], dtype=float)
+
+        # Aspects: later texts override earlier ones, as in the sequential path
+        aspects = {}
+        for r in records:
+            aspects.update(r["aspects"])
+
+        # Emotions: sum scores per label, keeping first-seen label order
+        emotions = {}
+        pairs = [(label, score) for r in records for label, score in r["emotions"].items()]
+        if pairs:
+            emotion_labels = np.array([p[0] for p in pairs], dtype=object)
+            emotion_scores = np.array([p[1] for p in pairs], dtype=float)
+            unique, first_index, inverse = np.unique(emotion_labels, return_index=True, return_inverse=True)
+            sums = np.bincount(inverse, weights=emotion_scores, minlength=len(unique))
+            for i in np.argsort(first_index):
+                emotions[unique[i]] = float(sums[i])
+
+        # Full per-text emotion distributions, kept as a matrix for the emotion profile
+        emotion_labels, matrix = emotion_matrix([r["emotions"] for r in records])
+        return {"counts": counts, "emotions": emotions, "aspects": aspects,
+                "emotion_labels": emotion_labels, "emotion_matrix": matrix}
+
+    @staticmethod
+    def _merge_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine partial aggregates of consecutive shards, in shard order."""
+        counts = np.zeros(3)
+        emotions = {}
+        aspects = {}
+        for partial in partials:
+            counts += partial["counts"]
+            for emotion, score in partial["emotions"].items():
+                emotions[emotion] = emotions.get(emotion, 0) + score
+            aspects.update(partial["aspects"])
+        emotion_labels, matrix = stack_matrices([(p["emotion_labels"], p["emotion_matrix"]) for p in partials])
+        return {"counts": counts, "emotions": emotions, "aspects": aspects,
+                "emotion_labels": emotion_labels, "emotion_matrix": matrix}
+
+    @staticmethod
+    def _distribution(counts: np.ndarray) -> Dict[str, float]:
+        percents = counts / counts.sum() * 100
+        return dict(zip(("positive", "neutral", "negative"), percents.tolist()))
+
+    def _infer_cached(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Per-text records, running inference only on texts missing from the cache."""
+        if self.cache is not None:
+            return self.cache.get_or_compute(texts, self.model_version, self._infer_batch)
+        return self._infer_batch(texts)
+
+    def _analyze_batched(self, texts: List[str]) -> Dict[str, Any]:
+        """Batched analysis path: whole lists per pipeline, only uncached texts are inferred."""
+        return self._partial_aggregate(self._infer_cached(texts))
+
+    def _analyze_sharded(self, texts: List[str]) -> Dict[str, Any]:
+        """Sharded analysis path: shards run on a worker process pool and partials are merged."""
+        try:
+            partial, self.last_shard_stats = analyze_sharded(
+                self, texts, self.workers, self.shard_size, self.shard_timeout
+            )
+        except mp.TimeoutError:
+            logger.error(f"Sharded analysis timed out after {self.shard_timeout:g}s; analyzing in-process")
+            self.last_shard_stats = {}
+            return self._analyze_batched(texts)
+        return partial
+
+    def _detect_temporal_patterns(self, current_sentiment: float, brand: str = "default") -> Dict[str, Any]:
+        """Detect temporal patterns in the brand's sentiment over the last ``temporal_window`` hours."""
+        history = self.history_store.buffer(brand)
+        if not len(history):
             return {"pattern": "initial", "trend": "stable", "velocity": 0.0}
-        
-        # Calculate sentiment velocity (rate of change)
-        recent_sentiments = self.sentiment_history[-self.temporal_window:]
-        if len(recent_sentiments) > 1:
-            velocity = (current_sentiment - recent_sentiments[0]) / len(recent_sentiments)
+
+        # Calculate sentiment velocity (change per hour) against the oldest sample in the window
+        now = history.latest()[0]
+        oldest = history.oldest_since(now - self.temporal_window * 3600)
+        if oldest is not None and oldest[0] < now:
+            hours = max(now - oldest[0], 300) / 3600  # at least 5 minutes, so close samples don't explode
+            velocity = (current_sentiment - oldest[1]) / hours
         else:
             velocity = 0.0
-            
+
         # Detect patterns
-        if velocity > 0.1:
+        if velocity > self.velocity_threshold:
             pattern = "accelerating_negative"
-        elif velocity < -0.1:
+        elif velocity < -self.velocity_threshold:
             pattern = "accelerating_positive"
-        elif abs(velocity) <= 0.1:
+        elif abs(velocity) <= self.velocity_threshold:
             pattern = "stable"
         else:
             pattern = "fluctuating"
@@ -160,121 +481,190 @@ class SentimentAnalysisTool(BaseTool):
         if temporal_data["pattern"] == "accelerating_negative":
             crisis_signals.append("Rapid negative sentiment acceleration")
             
-        # Check emotion intensity
-        if any(score > 0.8 for score in sentiment_data["emotions"].values()):
-            crisis_signals.append("High emotion intensity detected")
+        # Check emotion intensity: share of mentions dominated by negative emotions
+        profile = sentiment_data.get("emotion_profile")
+        if profile is not None and profile.strong_negative_share > self.emotion_crisis_share:
+            crisis_signals.append(
+                f"High emotion intensity detected ({profile.strong_negative_share:.0%} of mentions strongly negative)"
+            )
             
         # Check aspect-based signals
         negative_aspects = [aspect for aspect, data in sentiment_data["aspects"].items() 
                           if data["sentiment"] == "negative" and data["confidence"] > 0.7]
         if negative_aspects:
             crisis_signals.append(f"Negative sentiment in key aspects: {', '.join(negative_aspects)}")
+
+        # Check emerging topics while sentiment is already leaning negative
+        trending = sentiment_data.get("trending", [])
+        if trending and sentiment_data["negative_percent"] > self.crisis_threshold / 2:
+            crisis_signals.append(f"Emerging topics: {', '.join(t['keyword'] for t in trending[:5])}")
             
         return crisis_signals
 
-    def _run(self, text: Union[str, List[str]] = None, **kwargs) -> str:
+    def _build_result(self, partial: Dict[str, Any], brand: str = "default", total_texts: int = 0) -> SentimentResult:
+        """Update the brand history, detect temporal patterns and crisis signals, and publish the result."""
+        distribution = self._distribution(partial["counts"])
+        emotions = partial["emotions"]
+        aspects = partial["aspects"]
+        emotion_profile = partial.get("emotion_profile")
+        if emotion_profile is None and "emotion_matrix" in partial:
+            emotion_profile = EmotionProfile.from_matrix(
+                partial["emotion_labels"], partial["emotion_matrix"], total_texts
+            )
+
+        # Normalize emotions per analyzed text: texts the cascade did not score carry no emotion mass
+        total_emotions = sum(emotions.values())
+        if total_emotions > 0:
+            emotions = {k: v / max(total_texts, total_emotions) for k, v in emotions.items()}
+
+        # Update sentiment history
+        self.history_store.append(brand, distribution["negative"])
+
+        # Detect temporal patterns
+        temporal_data = self._detect_temporal_patterns(distribution["negative"], brand)
+
+        # Detect crisis signals
+        trending = self.trend_detector.trending(brand)
+        sentiment_data = {
+            "negative_percent": distribution["negative"],
+            "emotions": emotions,
+            "aspects": aspects,
+            "emotion_profile": emotion_profile,
+            "trending": trending
+        }
+        crisis_signals = self._detect_crisis_signals(sentiment_data, temporal_data)
+
+        result = SentimentResult(
+            brand=brand,
+            total_texts=total_texts,
+            distribution=distribution,
+            emotions=emotions,
+            aspects=aspects,
+            temporal=temporal_data,
+            crisis_signals=crisis_signals,
+            emotion_profile=emotion_profile,
+            trending_keywords=trending
+        )
+        self.last_result = result
+        publish_result(result)
+        return result
+
+    def analyze_stream(self, mentions: Iterable[str], brand: str = "default", snapshot_every: int = 100,
+                       snapshot_seconds: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a stream of mentions incrementally, yielding snapshot dicts.
+
+        Mentions are inferred in micro-batches of ``batch_size`` and folded into
+        running counters, so only one batch is held in memory at a time. A snapshot
+        is yielded every ``snapshot_every`` mentions and/or ``snapshot_seconds``
+        seconds (checked as mentions arrive). The last snapshot has ``final=True``
+        and carries the ``SentimentResult`` and its text ``report``, which also
+        updates the brand history.
+        """
+        accumulator = SentimentAccumulator()
+        pending: List[str] = []
+        received = 0
+        last_count = 0
+        last_time = time.monotonic()
+        started = last_time
+
+        def flush():
+            self.trend_detector.add_texts(brand, pending)
+            for record in self._infer_cached(pending):
+                accumulator.add(record)
+            pending.clear()
+
+        for mention in mentions:
+            if not mention:
+                continue
+            pending.append(mention)
+            received += 1
+            if len(pending) >= self.batch_size:
+                flush()
+
+            now = time.monotonic()
+            if (snapshot_every and received - last_count >= snapshot_every) or \
+                    (snapshot_seconds and now - last_time >= snapshot_seconds):
+                flush()
+                last_count, last_time = received, now
+                yield {**accumulator.snapshot(), "final": False, "elapsed": now - started}
+
+        flush()
+        if not accumulator.count:
+            return
+        snapshot = accumulator.snapshot()
+        result = self._build_result(accumulator.partial(), brand, accumulator.count)
+        snapshot["result"] = result
+        snapshot["report"] = result.render()
+        yield {**snapshot, "final": True, "elapsed": time.monotonic() - started}
+
+    def analyze_stored(self, brand: str, since: Optional[float] = None, until: Optional[float] = None,
+                       source: Optional[str] = None, store: Optional[MentionStore] = None) -> Optional[SentimentResult]:
+        """Analyze the brand's stored mentions in ``[since, until)``, streamed from the mention store."""
+        store = store or mention_store
+        final = None
+        for final in self.analyze_stream(store.iter_texts(brand, source, since, until), brand, snapshot_every=0):
+            pass
+        return final["result"] if final else None
+
+    def analyze(self, text: Union[str, List[str]], brand: str = "default") -> SentimentResult:
+        """Run the full analysis and return the typed result instead of the text rendering."""
+        # Convert single text to list
+        texts = [text] if isinstance(text, str) else text
+        self.trend_detector.add_texts(brand, texts)
+
+        if self.batched and self.workers > 1 and len(texts) > self.shard_size:
+            partial = self._analyze_sharded(texts)
+        elif self.batched:
+            partial = self._analyze_batched(texts)
+        else:
+            partial = self._analyze_sequential(texts)
+
+        return self._build_result(partial, brand, len(texts))
+
+    def _run(self, text: Union[str, List[str]] = None, brand: Optional[str] = None, **kwargs) -> str:
         """Run enhanced sentiment analysis with temporal patterns and crisis detection."""
         try:
             if not text:
                 return "Error: No text provided for analysis"
 
-            # Convert single text to list
-            texts = [text] if isinstance(text, str) else text
-            total = len(texts)
-
-            # Initialize results storage
-            results = []
-            distribution = {"positive": 0, "neutral": 0, "negative": 0}
-            emotions = {}
-            aspects = {}
+            final_output = self.analyze(text, brand or self.default_brand).render()
+            logger.info(f"Advanced sentiment analysis completed: {final_output}")
+            return final_output
 
-            # Process each text
-            for t in texts:
-                # Basic sentiment
-                try:
-                    result = self.primary_pipeline(t)[0]
-                except Exception:
-                    result = self.fallback_pipeline(t)[0]
-
-                # Categorize sentiment
-                if result["label"] == "POSITIVE" and result["score"] > 0.7:
-                    category = "positive"
-                elif result["label"] == "NEGATIVE" and result["score"] > 0.7:
-                    category = "negative"
-                else:
-                    category = "neutral"
-
-                # Update distribution
-                distribution[category] += 1
-
-                # Extract aspects and emotions
-                text_aspects = self._extract_aspects(t)
-                aspects.update(text_aspects)
-                text_emotions = self._detect_emotions(t)
-                for emotion, score in text_emotions.items():
-                    emotions[emotion] = emotions.get(emotion, 0) + score
-
-                results.append(result)
-
-            # Calculate percentages
-            for category in distribution:
-                distribution[category] = (distribution[category] / total) * 100
-
-            # Normalize emotions
-            total_emotions = sum(emotions.values())
-            if total_emotions > 0:
-                emotions = {k: v/total_emotions for k, v in emotions.items()}
-
-            # Update sentiment history
-            self.sentiment_history.append(distribution["negative"])
-            if len(self.sentiment_history) > self.temporal_window:
-                self.sentiment_history.pop(0)
-
-            # Detect temporal patterns
-            temporal_data = self._detect_temporal_patterns(distribution["negative"])
-
-            # Detect crisis signals
-            sentiment_data = {
-                "negative_percent": distribution["negative"],
-                "emotions": emotions,
-                "aspects": aspects
-            }
-            crisis_signals = self._detect_crisis_signals(sentiment_data, temporal_data)
-            crisis_detected = len(crisis_signals) > 0
-
-            # Format output
-            output = [
-                "Advanced Sentiment Analysis Report:",
-                f"- Sentiment Distribution:",
-                f"  - Positive: {distribution['positive']:.2f}%",
-                f"  - Neutral: {distribution['neutral']:.2f}%",
-                f"  - Negative: {distribution['negative']:.2f}%",
-                f"- Temporal Analysis:",
-                f"  - Pattern: {temporal_data['pattern']}",
-                f"  - Trend: {temporal_data['trend']}",
-                f"  - Velocity: {temporal_data['velocity']:.2f}",
-                f"- Top Emotions:"
-            ]
-            
-            # Add top emotions
-            for emotion, score in sorted(emotions.items(), key=lambda x: x[1], reverse=True)[:3]:
-                output.append(f"  - {emotion}: {score:.2f}")
-            
-            # Add key aspects
-            output.append(f"- Key Aspects:")
-            for aspect, data in sorted(aspects.items(), key=lambda x: x[1]["confidence"], reverse=True)[:3]:
-                output.append(f"  - {aspect}: {data['sentiment']} ({data['confidence']:.2f})")
-            
-            # Add crisis status
-            if crisis_detected:
-                output.append(f"- Crisis Status: DETECTED")
-                output.append(f"- Crisis Signals:")
-                for signal in crisis_signals:
-                    output.append(f"  - {signal}")
-            else:
-                output.append(f"- Crisis Status: No crisis detected")
+        except Exception as e:
+            logger.error(f"Sentiment analysis failed: {str(e)}", exc_info=True)
+            return f"Error: Sentiment analysis failed - {str(e)}"
 
-            final_output = "\n".join(output)
+    @property
+    def batcher(self) -> InferenceBatcher:
+        """Request coalescer serving ``_arun``, created on first use."""
+        if self._batcher is None:
+            self._batcher = InferenceBatcher(
+                self._infer_cached, max_batch_size=self.coalesce_batch_size,
+                max_wait_ms=self.coalesce_wait_ms, max_queue=self.coalesce_queue_depth
+            )
+        return self._batcher
+
+    def batcher_stats(self) -> Dict[str, Any]:
+        """Queue depth, coalesced batch sizes and queue-wait latency of the async path."""
+        return self.batcher.stats()
+
+    async def _arun(self, text: Union[str, List[str]] = None, brand: Optional[str] = None, **kwargs) -> str:
+        """Asynchronous implementation: requests are coalesced with concurrent callers into shared batches."""
+        if not text:
+            return "Error: No text provided for analysis"
+        brand = brand or self.default_brand
+        texts = [text] if isinstance(text, str) else text
+        if not self.batched or (self.workers > 1 and len(texts) > self.shard_size):
+            # Sequential and sharded runs keep their own execution model
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, lambda: self._run(text, brand, **kwargs))
+        try:
+            self.trend_detector.add_texts(brand, texts)
+            records = await self.batcher.submit(texts)
+            result = self._build_result(self._partial_aggregate(records), brand, len(texts))
+            final_output = result.render()
             logger.info(f"Advanced sentiment analysis completed: {final_output}")
             return final_output
 
@@ -282,39 +672,13 @@ class SentimentAnalysisTool(BaseTool):
             logger.error(f"Sentiment analysis failed: {str(e)}", exc_info=True)
             return f"Error: Sentiment analysis failed - {str(e)}"
 
-    async def _arun(self, text: Union[str, List[str]] = None, **kwargs) -> str:
-        """Asynchronous implementation using a thread pool for I/O-bound tasks."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: self._run(text, **kwargs))
-
-    def test_sentiment_tool(self) -> Dict:
-        """Automated test for sentiment analysis tool functionality."""
-        test_cases = [
-            {"text": "I love using CrewAI!", "expected": "positive"},
-            {"text": "CrewAI is okay, nothing special.", "expected": "neutral"},
-            {"text": "CrewAI is terrible and broken!", "expected": "negative"}
-        ]
-        results = []
-        for case in test_cases:
-            try:
-                output = self._run(case["text"])
-                sentiment = "positive" if "Positive" in output else "negative" if "Negative" in output else "neutral"
-                passed = sentiment == case["expected"]
-                results.append({
-                    "text": case["text"],
-                    "expected": case["expected"],
-                    "actual": sentiment,
-                    "passed": passed,
-                    "output": output
-                })
-                logger.info(f"Test case '{case['text']}': {'Passed' if passed else 'Failed'}")
-            except Exception as e:
-                logger.error(f"Test case '{case['text']}' failed with error: {str(e)}")
-                results.append({
-                    "text": case["text"],
-                    "expected": case["expected"],
-                    "actual": "error",
-                    "passed": False,
-                    "output": str(e)
-                })
-        return {"test_results": results}
\ No newline at end of file
+    def benchmark(self, batch_sizes: Sequence[int] = BATCH_SIZES, size: int = 512,
+                  output_path: Optional[str] = None) -> Dict[str, Any]:
+        """Throughput, latency, peak RSS and per-stage timings on the bundled corpus, with this tool's settings."""
+        return run_benchmark(
+            batch_sizes, size, output_path,
+            analyze_emotions=self.analyze_emotions, analyze_aspects=self.analyze_aspects,
+            backend=self.backend, onnx_threads=self.onnx_threads, language_routing=self.language_routing,
+            cascade=self.cascade, lexicon_threshold=self.lexicon_threshold,
+            positive_threshold=self.positive_threshold, model_registry=self.model_registry
+        )
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import multiprocessing as mp
+from typing import Dict, List, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Tool instance owned by each worker process, created once by the pool initializer
+_worker_tool = None
+
+# Worker pools kept alive across runs, keyed by start method, size and tool settings
+_pools: Dict[str, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def _warm_up(tool):
+    """Load every model the tool will need, once per worker."""
+    tool._chunked("primary")
+    if tool.analyze_emotions:
+        tool._chunked("emotion")
+    if tool.analyze_aspects:
+        tool.aspect_engine
+
+
+def _init_worker(settings: Dict[str, Any], model_specs: Optional[Dict[str, Dict[str, str]]],
+                 cache_path: Optional[str], threads: int):
+    global _worker_tool
+    from tools.sentiment_tool import SentimentAnalysisTool
+    from tools.sentiment_cache import SentimentCache
+    from tools.model_registry import ModelRegistry
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    # Each worker opens its own cache connection and loads its own models
+    cache = SentimentCache(cache_path) if settings["use_cache"] else None
+    model_registry = ModelRegistry(model_specs) if model_specs is not None else None
+    _worker_tool = SentimentAnalysisTool(**settings, model_registry=model_registry, cache=cache, workers=1)
+    _warm_up(_worker_tool)
+
+
+def _analyze_shard(texts: List[str]) -> Tuple[Dict[str, Any], int, int, float, Dict[str, int]]:
+    start = time.perf_counter()
+    before = dict(_worker_tool.cascade_stats)
+    partial = _worker_tool._partial_aggregate(_worker_tool._infer_cached(texts))
+    # Cascade tier counts of this shard only, merged back into the parent tool
+    cascade_stats = {k: v - before[k] for k, v in _worker_tool.cascade_stats.items()}
+    return partial, os.getpid(), len(texts), time.perf_counter() - start, cascade_stats
+
+
+def _context():
+    """
+    Start method for worker pools. Never fork: forking a parent that has already
+    run multithreaded PyTorch deadlocks the children.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        # Fork workers from a server that has the (model-free) sentiment modules imported
+        ctx.set_forkserver_preload(["tools.sentiment_tool"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def _pool(workers: int, settings: Dict[str, Any], model_specs: Optional[Dict[str, Dict[str, str]]],
+          cache_path: Optional[str], threads: int) -> Tuple[str, Any]:
+    """Worker pool for these settings, started on first use and reused by later runs."""
+    ctx = _context()
+    key = json.dumps([ctx.get_start_method(), workers, settings, model_specs, cache_path, threads],
+                     sort_keys=True, default=str)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ctx.Pool(
+                processes=workers,
+                initializer=_init_worker,
+                initargs=(settings, model_specs, cache_path, threads)
+            )
+            _pools[key] = pool
+            logger.info(f"Started {workers} sentiment workers ({ctx.get_start_method()})")
+        return key, pool
+
+
+def _discard_pool(key: str):
+    with _pools_lock:
+        pool = _pools.pop(key, None)
+    if pool is not None:
+        pool.terminate()
+
+
+@atexit.register
+def close_pools():
+    """Shut down every worker pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.terminate()
+
+
+def analyze_sharded(tool, texts: List[str], workers: int, shard_size: int,
+                    timeout: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split ``texts`` into shards and analyze them on a process pool.
+
+    Workers are started with forkserver (or spawn), load the models once in
+    their initializer and are reused by later runs with the same settings.
+    Raises ``multiprocessing.TimeoutError`` if the shards are not done within
+    ``timeout`` seconds; the stuck pool is terminated. Returns the merged
+    partial aggregate (identical in structure to a single-process run) and
+    throughput stats per worker.
+    """
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+    workers = max(1, min(workers, len(shards)))
+
+    settings = {
+        "batch_size": tool.batch_size,
+        "analyze_emotions": tool.analyze_emotions,
+        "analyze_aspects": tool.analyze_aspects,
+        "backend": tool.backend,
+        "onnx_threads": tool.onnx_threads,
+        "use_cache": tool.cache is not None,
+        "language_routing": tool.language_routing,
+        "cascade": tool.cascade,
+        "lexicon_threshold": tool.lexicon_threshold,
+        "positive_threshold": tool.positive_threshold,
+        "custom_keywords": tool.custom_keywords,
+    }
+    # Only the specs cross the process boundary; loaders registered at runtime are rebuilt by each tool
+    model_specs = tool.model_registry.specs
+    cache_path = tool.cache.db_path if tool.cache is not None else None
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    start = time.perf_counter()
+    key, pool = _pool(workers, settings, model_specs, cache_path, threads)
+    try:
+        results = pool.map_async(_analyze_shard, shards, chunksize=1).get(timeout)
+    except mp.TimeoutError:
+        _discard_pool(key)
+        raise
+    wall = time.perf_counter() - start
+
+    per_worker: Dict[int, Dict[str, Any]] = {}
+    for result in results:
+        for k, v in result[4].items():
+            tool.cascade_stats[k] += v
+    for _, pid, count, seconds, _ in results:
+        stats = per_worker.setdefault(pid, {"shards": 0, "texts": 0, "busy_seconds": 0.0})
+        stats["shards"] += 1
+        stats["texts"] += count
+        stats["busy_seconds"] += seconds
+    for stats in per_worker.values():
+        stats["texts_per_second"] = stats["texts"] / stats["busy_seconds"] if stats["busy_seconds"] else 0.0
+
+    shard_stats = {
+        "workers": workers,
+        "shards": len(shards),
+        "texts": len(texts),
+        "wall_seconds": wall,
+        "texts_per_second": len(texts) / wall if wall else 0.0,
+        "per_worker": per_worker,
+    }
+    logger.info(f"Sharded sentiment analysis: {len(texts)} texts on {workers} workers in {wall:.2f}s")
+    return tool._merge_partials([r[0] for r in results]), shard_stats
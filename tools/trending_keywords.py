@@ -0,0 +1,154 @@
+import re
+import time
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+_HASHTAG = re.compile(r"#(\w*[^\W\d_]\w*)")
+
+
+def extract_hashtags(text: str) -> List[str]:
+    """Lowercased hashtags of ``text`` (purely numeric tags such as ``#12`` are skipped)."""
+    return [f"#{tag.lower()}" for tag in _HASHTAG.findall(text)]
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary over at most ``capacity`` keys.
+
+    When full, a new key replaces the current minimum and inherits its count as
+    overestimation ``error``; any key whose true frequency exceeds
+    total / capacity is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.counts: Dict[str, float] = {}
+        self.errors: Dict[str, float] = {}
+        self.total = 0.0
+
+    def add(self, key: str, weight: float = 1.0):
+        self.total += weight
+        if key in self.counts:
+            self.counts[key] += weight
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = weight
+            self.errors[key] = 0.0
+            return
+        victim = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(victim)
+        del self.errors[victim]
+        self.counts[key] = floor + weight
+        self.errors[key] = floor
+
+    def estimate(self, key: str) -> float:
+        """Upper-bound count of ``key`` (0 if untracked)."""
+        return self.counts.get(key, 0.0)
+
+    def guaranteed(self, key: str) -> float:
+        """Lower-bound count of ``key``."""
+        return self.counts.get(key, 0.0) - self.errors.get(key, 0.0)
+
+    def top(self, n: int = 10) -> List[Tuple[str, float]]:
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class TrendingKeywordDetector:
+    """
+    Per-brand trending-keyword detector over fixed-size time buckets.
+
+    Each brand keeps a ring of ``baseline_buckets + 1`` Space-Saving summaries,
+    one per ``bucket_seconds`` bucket, so memory is bounded by brands x buckets x
+    ``capacity`` no matter how much text is fed in. A keyword is trending when its
+    rate in the current bucket is at least ``spike_ratio`` times its mean rate over
+    the previous buckets (empty buckets count as zero) and it has been seen at
+    least ``min_count`` times in the current bucket. Nothing trends until a brand
+    has at least one earlier bucket.
+    """
+
+    def __init__(self, capacity: int = 200, bucket_seconds: int = 3600, baseline_buckets: int = 24,
+                 spike_ratio: float = 3.0, min_count: int = 5):
+        self.capacity = capacity
+        self.bucket_seconds = bucket_seconds
+        self.baseline_buckets = baseline_buckets
+        self.spike_ratio = spike_ratio
+        self.min_count = min_count
+        self._buckets: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, brand: str, timestamp: float) -> SpaceSaving:
+        start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+        ring = self._buckets.setdefault(brand, deque(maxlen=self.baseline_buckets + 1))
+        if not ring or ring[-1][0] < start:
+            ring.append((start, SpaceSaving(self.capacity)))
+        elif ring[-1][0] > start:
+            # Late arrival: fold into its own bucket if still kept, otherwise the oldest one
+            for bucket_start, summary in reversed(ring):
+                if bucket_start <= start:
+                    return summary
+            return ring[0][1]
+        return ring[-1][1]
+
+    def add(self, brand: str, keywords: Iterable[str], timestamp: Optional[float] = None):
+        """Count one occurrence of each keyword."""
+        self.add_counts(brand, ((k, 1.0) for k in keywords), timestamp)
+
+    def add_counts(self, brand: str, counts: Iterable[Tuple[str, float]], timestamp: Optional[float] = None):
+        """Count pre-aggregated ``(keyword, count)`` pairs, e.g. from a ``Counter``."""
+        with self._lock:
+            summary = self._bucket(brand, timestamp or time.time())
+            for keyword, count in counts:
+                summary.add(keyword, count)
+
+    def add_texts(self, brand: str, texts: Iterable[str], timestamp: Optional[float] = None):
+        """Count the hashtags of raw mentions."""
+        self.add(brand, (tag for text in texts for tag in extract_hashtags(text)), timestamp)
+
+    def trending(self, brand: str, now: Optional[float] = None, top_n: int = 10) -> List[Dict[str, Any]]:
+        """Keywords spiking in the current bucket against their rolling baseline, strongest first."""
+        now = now or time.time()
+        current_start = int(now // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            ring = self._buckets.get(brand)
+            if not ring or ring[-1][0] != current_start:
+                return []
+            current = ring[-1][1]
+            history = [summary for start, summary in ring
+                       if current_start - self.baseline_buckets * self.bucket_seconds <= start < current_start]
+            if not history:
+                return []  # no baseline yet: on a cold start everything would look like a spike
+            # Average over the buckets the brand has existed for, empty ones included
+            spanned = min(self.baseline_buckets, (current_start - ring[0][0]) // self.bucket_seconds)
+
+            # Extrapolate the partial current bucket, but not from its first few minutes
+            elapsed = max(now - current_start, self.bucket_seconds * 0.1)
+            scale = self.bucket_seconds / elapsed
+            spikes = []
+            for keyword, _ in current.top(self.capacity):
+                count = current.guaranteed(keyword)
+                if count < self.min_count:
+                    continue
+                baseline = sum(s.estimate(keyword) for s in history) / spanned
+                rate = count * scale
+                ratio = rate / max(baseline, 1.0)
+                if ratio >= self.spike_ratio:
+                    spikes.append({
+                        "keyword": keyword,
+                        "count": count,
+                        "rate_per_bucket": round(rate, 2),
+                        "baseline_per_bucket": round(baseline, 2),
+                        "ratio": round(ratio, 2),
+                    })
+        spikes.sort(key=lambda s: s["ratio"], reverse=True)
+        return spikes[:top_n]
+
+    def top(self, brand: str, n: int = 10) -> List[Tuple[str, float]]:
+        """Approximate top keywords of the brand's current bucket."""
+        with self._lock:
+            ring = self._buckets.get(brand)
+            return ring[-1][1].top(n) if ring else []
+
+
+# Shared by the keyword extractor and the sentiment tool
+trending_keywords = TrendingKeywordDetector()
@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+TWITTER_STATE_DB = os.getenv("TWITTER_STATE_DB", os.path.join("db", "twitter_state.db"))
+
+
+class TwitterCursorStore:
+    """
+    Per-brand ``since_id`` high-water marks, persisted to SQLite.
+
+    Refreshes pass the stored id as ``since_id`` so only tweets newer than the
+    last fetch are downloaded, across restarts. Everything up to the high-water
+    mark has been fetched; a refresh that stops before paging down to it (volume
+    cap, rate limit) leaves a backfill cursor instead - the ``max_id`` to resume
+    paging from and the newest id of that run, which becomes the high-water mark
+    once the gap is closed.
+    """
+
+    def __init__(self, db_path: Optional[str] = TWITTER_STATE_DB):
+        self.db_path = db_path
+        self._memory: Dict[str, int] = {}
+        self._backfill: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS twitter_cursors ("
+                "brand TEXT PRIMARY KEY, since_id INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS twitter_backfill ("
+                "brand TEXT PRIMARY KEY, max_id INTEGER NOT NULL, top_id INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, brand: str) -> Optional[int]:
+        key = brand.lower()
+        with self._lock:
+            if key not in self._memory:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT since_id FROM twitter_cursors WHERE brand = ?", (key,)
+                ).fetchone() if conn is not None else None
+                if row is None:
+                    return None
+                self._memory[key] = row[0]
+            return self._memory[key]
+
+    def advance(self, brand: str, since_id: int):
+        """Move the brand's high-water mark forward (never backwards)."""
+        key = brand.lower()
+        with self._lock:
+            current = self.get(brand)
+            if current is not None and since_id <= current:
+                return
+            self._memory[key] = since_id
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO twitter_cursors (brand, since_id, updated_at) VALUES (?, ?, ?)",
+                    (key, since_id, time.time())
+                )
+                conn.commit()
+
+    def backfill(self, brand: str) -> Optional[Tuple[int, int]]:
+        """Pending ``(max_id, top_id)`` of an interrupted refresh, or None."""
+        key = brand.lower()
+        with self._lock:
+            if key not in self._backfill:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT max_id, top_id FROM twitter_backfill WHERE brand = ?", (key,)
+                ).fetchone() if conn is not None else None
+                self._backfill[key] = tuple(row) if row is not None else None
+            return self._backfill[key]
+
+    def set_backfill(self, brand: str, max_id: int, top_id: int):
+        key = brand.lower()
+        with self._lock:
+            self._backfill[key] = (max_id, top_id)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO twitter_backfill (brand, max_id, top_id, updated_at) VALUES (?, ?, ?, ?)",
+                    (key, max_id, top_id, time.time())
+                )
+                conn.commit()
+
+    def clear_backfill(self, brand: str):
+        key = brand.lower()
+        with self._lock:
+            self._backfill[key] = None
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM twitter_backfill WHERE brand = ?", (key,))
+                conn.commit()
+
+    def reset(self, brand: str):
+        key = brand.lower()
+        with self._lock:
+            self._memory.pop(key, None)
+            self._backfill.pop(key, None)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM twitter_cursors WHERE brand = ?", (key,))
+                conn.execute("DELETE FROM twitter_backfill WHERE brand = ?", (key,))
+                conn.commit()
+
+
+class RateLimitWindow:
+    """
+    Remaining calls and reset time of one rate-limited endpoint, taken from the
+    ``x-rate-limit-*`` response headers. Lets callers spend what is left of the
+    current window and stop, instead of sleeping until it resets.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, headers: Dict[str, Any]):
+        with self._lock:
+            if headers.get("x-rate-limit-limit") is not None:
+                self.limit = int(headers["x-rate-limit-limit"])
+            if headers.get("x-rate-limit-remaining") is not None:
+                self.remaining = int(headers["x-rate-limit-remaining"])
+            if headers.get("x-rate-limit-reset") is not None:
+                self.reset_at = float(headers["x-rate-limit-reset"])
+
+    def exhaust(self, reset_at: Optional[float] = None):
+        """Mark the window as used up (e.g. after a 429)."""
+        with self._lock:
+            self.remaining = 0
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def available(self, now: Optional[float] = None) -> Optional[int]:
+        """Calls left in the current window; None while unknown (no call made yet)."""
+        now = now or time.time()
+        with self._lock:
+            if self.reset_at is not None and now >= self.reset_at:
+                self.remaining = self.limit  # a new window has started
+                self.reset_at = None
+            return self.remaining
+
+    def status(self) -> Dict[str, Any]:
+        available = self.available()
+        return {
+            "limit": self.limit,
+            "remaining": available,
+            "resets_in_seconds": round(max(self.reset_at - time.time(), 0.0), 1) if self.reset_at else None,
+        }
+
+
+# Shared by every TwitterFetchTool in the process
+twitter_cursors = TwitterCursorStore()
+search_rate_limit = RateLimitWindow()